@@ -2,53 +2,137 @@
     Connects all modules, orchestrating the flow of data and control. 
 """
 
-from typing import List, Dict, Any, Optional
-from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter, defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
 import asyncio
+import functools
+import hashlib
+import heapq
+import itertools
+import operator
+import threading
 import time
-import json
+import uuid
 import os
+import sys
+import orjson
+import contentEncoding
+import eventLoop
 import queryGenerator
-from geminiClient.gemini import GeminiGroundedClient
+from pathlib import Path
+from reportStorage import REPORTS_DIR, load_json, save_json
+from jobStore import JobStore
+from geminiShared import GEMINI_CACHE_FILE, get_gemini_client
 from domainAnalyzer.domain_analyzer import DomainAnalyzer
 
+__all__ = ['Analyzer', 'AnalysisState']
+
+
+def _cached_per_epoch(method):
+    """
+    Memoize an aggregation method until the analysis results are replaced.
+    
+    Cached values are returned as-is, so callers must treat them as read-only.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, self._results_epoch, args, tuple(sorted(kwargs.items())))
+        if key not in self._agg_cache:
+            self._agg_cache[key] = method(self, *args, **kwargs)
+        return self._agg_cache[key]
+    return wrapper
+
+
+@dataclass(frozen=True)
+class AnalysisState:
+    """
+    Immutable snapshot of an analysis' progress.
+    
+    The Analyzer replaces the whole snapshot on every change, so readers on
+    other threads always see a status, URL and query count that belong together.
+    """
+    status: str = "idle"  # idle, analyzing, complete, error
+    url: str = ""
+    queries_to_run: int = 0
+    num_queries: int = 0  # number of generated queries
+    queries_done: int = 0  # generated queries whose Gemini analysis has finished
+    job_id: str = ""  # id of the analysis started by submit_analysis (the JobStore id, if any)
+
 
 class Analyzer:
     """
     Connects all modules, orchestrating the flow of data and control.
     """
 
-    def __init__(self, demo_mode: bool = False):
-        self.domain_analyzer = DomainAnalyzer()
-        self.gemini_client = GeminiGroundedClient()
+    def __init__(self, demo_mode: bool = False, job_store: Optional[JobStore] = None):
+        self.gemini_cache_file: Path = GEMINI_CACHE_FILE
+        self.gemini_client = get_gemini_client()
+        self.domain_analyzer = DomainAnalyzer(self.gemini_client)
         self.generate_queries = queryGenerator.generate_queries_from_url
         self.url: str = queryGenerator.DEFAULT_URL
         self.queriesToRun: int = queryGenerator.NUM_OF_QUERIES
         self.generated_queries: List[Dict[str, Any]] = []
         self.analysis_results: List[Dict[str, Any]] = []
-        self.analysis_status: str = "idle"  # idle, analyzing, complete, error
+        self._state = AnalysisState(url=self.url, queries_to_run=self.queriesToRun)
+        self._status_lock = threading.Lock()
+        self._state_changed = threading.Condition(self._status_lock)  # notified whenever _state is replaced
+        self._future: Optional[Future] = None
+        self._details_index: Dict[str, Dict[str, Any]] = {}  # query -> get_query_details payload
+        self._results_epoch: int = 0  # bumped whenever analysis results are replaced
+        self._agg_cache: Dict[Any, Any] = {}
+        # Per-domain tallies built in a single pass by _precompute_aggregates
+        self._domain_link_counts: Counter = Counter()  # total citations across all queries
+        self._domain_query_counts: Counter = Counter()  # number of queries citing the domain
+        self._domain_type_counts: Dict[str, Dict[str, int]] = {}  # direct/generic/total query counts
         self.demo_mode: bool = demo_mode  
-        self.demo_save_file: str = r'analysisReports\demo_analysis_data.json'
+        self.job_store: Optional[JobStore] = job_store  # records analyses started by submit_analysis
+        self.demo_save_file: Path = REPORTS_DIR / 'demo_analysis_data.json'
+        self.save_file: Path = REPORTS_DIR / 'domain_analysis_prompted.json'
 
-    def run_analysis(self, url: Optional[str] = None, saveResults: bool = True, queriesToRun: int = None) -> List[Dict[str, Any]]:
+    def run_analysis(self, url: Optional[str] = None, saveResults: bool = True, queriesToRun: int = None, bypass_cache: bool = False) -> List[Dict[str, Any]]:
         """
-        Runs the analysis pipeline.
+        Runs the analysis pipeline, blocking until it finishes.
+        
+        The pipeline runs on the shared background loop rather than a fresh
+        asyncio.run() loop: the crawl/Gemini semaphores and caches are bound
+        to that loop, and its connection pools stay warm between runs.
 
         Args:
             url (Optional[str], optional): The URL to analyze. Defaults to value set in self.url.
             saveResults (bool, optional): Whether to save the results. Defaults to False.
+            bypass_cache (bool, optional): Whether to ignore cached Gemini responses. Defaults to False.
+
+        Returns:
+            List[Dict[str, Any]]: The analysis results.
+        """
+        return eventLoop.run_coroutine(self.run_analysis_async(url, saveResults, queriesToRun, bypass_cache))
+
+    async def run_analysis_async(self, url: Optional[str] = None, saveResults: bool = True, queriesToRun: int = None, bypass_cache: bool = False) -> List[Dict[str, Any]]:
+        """
+        Runs the analysis pipeline as a coroutine.
+        
+        Blocking file I/O is pushed to worker threads so the event loop stays
+        free for other work (e.g. structure analyses on the shared loop).
+
+        Args:
+            url (Optional[str], optional): The URL to analyze. Defaults to value set in self.url.
+            saveResults (bool, optional): Whether to save the results. Defaults to False.
+            bypass_cache (bool, optional): Whether to ignore cached Gemini responses. Defaults to False.
 
         Returns:
             List[Dict[str, Any]]: The analysis results.
         """
         try:
-            self.analysis_status = "analyzing"
+            self._set_status("analyzing")
             
             # Demo mode: Load saved data instead of running full analysis
             if self.demo_mode:
                 print("Demo mode enabled - loading saved analysis data...")
-                if self._load_demo_data(url, queriesToRun):
-                    self.analysis_status = "complete"
+                if await asyncio.to_thread(self._load_demo_data, url, queriesToRun):
+                    self._set_status("complete")
+                    await self._finish_job("complete")
                     return self.analysis_results
                 else:
                     print("No demo data found, running actual analysis...")
@@ -63,36 +147,259 @@ class Analyzer:
 
             if queriesToRun is None:
                 queriesToRun = self.queriesToRun
+            self.queriesToRun = queriesToRun  # published with the 'complete' status
+            self._update_state(url=url, queries_to_run=queriesToRun, num_queries=0, queries_done=0)
 
-            # Run the async function synchronously with the specified number of queries
-            generated_queries = asyncio.run(self.generate_queries(url, queriesToRun))
+            # generate and analyze queries
+            generated_queries, analysis_results = await self._run_pipeline(url, queriesToRun, bypass_cache)
             self.generated_queries = generated_queries
+            self.analysis_results = analysis_results
+            self._invalidate_result_caches()
+            # The tallies touch every link of every result; build them off the loop
+            await asyncio.to_thread(self._materialize_results)
 
-            # analyze domains
-            self.analysis_results = self.domain_analyzer.analyze_queries(generated_queries, resolve_urls=True)
+            # Everything the endpoints serve is built; publish it before the report files are written
+            self._set_status("complete")
 
             # save results
             if saveResults:
-                self.domain_analyzer.save_analysis(self.analysis_results)
-                self._save_demo_data(url, queriesToRun)
+                try:
+                    await asyncio.to_thread(self.domain_analyzer.save_analysis, self.analysis_results, self.save_file)
+                    await asyncio.to_thread(self._save_demo_data, url, queriesToRun)
+                except Exception as e:
+                    print(f"Warning: could not save analysis results: {e}")
 
-            self.analysis_status = "complete"
+            await self._finish_job("complete")
             return self.analysis_results
+        
+        except asyncio.CancelledError:
+            self._set_status("idle")
+            print("Analysis cancelled")
+            await self._finish_job("cancelled")
+            raise
             
         except Exception as e:
-            self.analysis_status = "error"
+            self._set_status("error")
             print(f"Analysis error: {e}")
+            await self._finish_job("error", str(e))
             raise e
 
+    async def _finish_job(self, status: str, error: Optional[str] = None):
+        """
+        Record the outcome of the analysis started by submit_analysis in the job store.
+        
+        Args:
+            status (str): Final job status ('complete', 'error' or 'cancelled')
+            error (Optional[str]): Error message for failed analyses
+        """
+        await asyncio.to_thread(self._record_job, self._state, status, error)
+
+    def _create_job(self, state: AnalysisState):
+        """
+        Add the job of a submitted analysis to the job store (blocking); failures are only logged.
+        
+        Args:
+            state (AnalysisState): Snapshot published by submit_analysis (job id, URL, query count)
+        """
+        if self.job_store is None or not state.job_id:
+            return
+        try:
+            self.job_store.create(state.url, state.queries_to_run, job_id=state.job_id)
+        except Exception as e:
+            print(f"Warning: could not record job {state.job_id}: {e}")
+
+    def _record_job(self, state: AnalysisState, status: str, error: Optional[str] = None):
+        """
+        Write a job's outcome to the job store (blocking); failures are only logged.
+        
+        The job row is created first if it is not there yet (e.g. the analysis
+        was cancelled before its task recorded it).
+        
+        Args:
+            state (AnalysisState): Snapshot of the job (nothing is written without a job id or a job store)
+            status (str): Final job status ('complete', 'error' or 'cancelled')
+            error (Optional[str]): Error message for failed analyses
+        """
+        if self.job_store is None or not state.job_id:
+            return
+        try:
+            self.job_store.create(state.url, state.queries_to_run, job_id=state.job_id)
+            self.job_store.finish(state.job_id, status, error)
+        except Exception as e:
+            print(f"Warning: could not record job {state.job_id}: {e}")
+
+    async def _run_pipeline(self, url: str, queriesToRun: int, bypass_cache: bool = False) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Generate queries for the URL and analyze them.
+
+        Args:
+            url (str): The URL to generate queries from.
+            queriesToRun (int): The number of queries to generate.
+            bypass_cache (bool, optional): Whether to ignore cached Gemini responses. Defaults to False.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: The generated queries and their analysis results.
+        """
+        generated_queries = await self.generate_queries(url, queriesToRun)
+        # Publish progress as it happens, so status streams can report it
+        self._update_state(num_queries=len(generated_queries), queries_done=0)
+        done = itertools.count(1)
+        analysis_results = await self.domain_analyzer.analyze_queries_async(
+            generated_queries, resolve_urls=True, bypass_cache=bypass_cache,
+            on_result=lambda: self._update_state(queries_done=next(done))
+        )
+        return generated_queries, analysis_results
+
+    def submit_analysis(self, url: Optional[str] = None, saveResults: bool = True, queriesToRun: int = None, bypass_cache: bool = False, loop: Optional[asyncio.AbstractEventLoop] = None) -> Future:
+        """
+        Schedule run_analysis_async on an event loop and return immediately.
+
+        Args:
+            url (Optional[str], optional): The URL to analyze. Defaults to value set in self.url.
+            saveResults (bool, optional): Whether to save the results. Defaults to True.
+            queriesToRun (int, optional): Number of queries to generate. Defaults to self.queriesToRun.
+            bypass_cache (bool, optional): Whether to ignore cached Gemini responses. Defaults to False.
+            loop (Optional[asyncio.AbstractEventLoop], optional): Running loop to use. Defaults to the shared background loop.
+
+        Returns:
+            Future: Resolves to the analysis results, or raises the analysis error.
+                Cancelling it cancels the analysis. The new job's id is published
+                as get_state().job_id; its job_store row is written by the task,
+                so no disk I/O happens under the state lock (or a caller's lock).
+
+        Raises:
+            RuntimeError: If an analysis is already running.
+        """
+        with self._status_lock:
+            if self._state.status == "analyzing":
+                raise RuntimeError("Analysis is already running")
+            url_to_run = self.url if url is None else url
+            queries = self.queriesToRun if queriesToRun is None else queriesToRun
+            self._state = replace(
+                self._state,
+                status="analyzing",
+                url=url_to_run,
+                queries_to_run=queries,
+                num_queries=0,
+                queries_done=0,
+                job_id=uuid.uuid4().hex
+            )
+            self._state_changed.notify_all()
+            self._future = asyncio.run_coroutine_threadsafe(
+                self._run_submitted(self._state, url, saveResults, queriesToRun, bypass_cache),
+                loop or eventLoop.get_loop()
+            )
+            future = self._future
+        # Outside the lock: runs right away if the analysis already ended
+        future.add_done_callback(self._publish_final_state)
+        return future
+
+    async def _run_submitted(self, state: AnalysisState, url: Optional[str], saveResults: bool, queriesToRun: Optional[int], bypass_cache: bool) -> List[Dict[str, Any]]:
+        """Task scheduled by submit_analysis: record the job, then run the analysis."""
+        await asyncio.to_thread(self._create_job, state)
+        return await self.run_analysis_async(url, saveResults, queriesToRun, bypass_cache)
+
+    def _publish_final_state(self, future: Future):
+        """
+        Done-callback of submit_analysis: publish the outcome if the task ended without recording it.
+        
+        Happens when the task is cancelled before it starts. Publishing the
+        snapshot once wakes status streams immediately, and every later reader
+        gets the same snapshot (so its cached status bytes are reused). The
+        outcome is also recorded in the job store, since _finish_job never ran.
+        """
+        with self._state_changed:
+            if self._future is not future or self._state.status != "analyzing":
+                return
+            self._state = replace(self._state, status="idle" if future.cancelled() else "error")
+            self._state_changed.notify_all()
+            state = self._state
+        # Outside the lock: a blocking sqlite write
+        if future.cancelled():
+            self._record_job(state, "cancelled")
+        else:
+            self._record_job(state, "error", str(future.exception()))
+
+    def cancel_analysis(self) -> bool:
+        """
+        Cancel the analysis started by submit_analysis, if it is still running.
+
+        Returns:
+            bool: True if a running analysis was cancelled.
+        """
+        future = self._future
+        return future is not None and future.cancel()
+
+    def _update_state(self, **changes):
+        """
+        Publish a new state snapshot with the given fields changed.
+        
+        Args:
+            **changes: AnalysisState fields to replace
+        """
+        with self._state_changed:
+            self._state = replace(self._state, **changes)
+            self._state_changed.notify_all()
+
+    def _set_status(self, status: str):
+        """
+        Update the analysis status.
+        
+        Args:
+            status (str): New status ('idle', 'analyzing', 'complete', 'error')
+        """
+        if status == "complete":
+            # Publish the finished analysis' metadata together with its status
+            num_queries = len(self.generated_queries)
+            self._update_state(status=status, url=self.url, queries_to_run=self.queriesToRun, num_queries=num_queries, queries_done=num_queries)
+        else:
+            self._update_state(status=status)
+
+    @property
+    def analysis_status(self) -> str:
+        """Current status as last recorded ('idle', 'analyzing', 'complete', 'error')."""
+        return self._state.status
+
+    def get_state(self) -> AnalysisState:
+        """
+        Get a consistent snapshot of the analysis state without blocking on a running analysis.
+        
+        Returns:
+            AnalysisState: The current snapshot; never mutated after it is returned
+        """
+        state = self._state
+        future = self._future
+        if future is not None and future.done() and state.status == "analyzing":
+            # The task ended (or was cancelled before starting) without recording the outcome
+            return replace(state, status="idle" if future.cancelled() else "error")
+        return state
+
+    def wait_for_state_change(self, previous: Optional[AnalysisState], timeout: float) -> AnalysisState:
+        """
+        Block until the state differs from a previously returned snapshot, or the timeout passes.
+        
+        Args:
+            previous (Optional[AnalysisState]): Snapshot the caller already has; None returns immediately
+            timeout (float): Maximum seconds to wait
+            
+        Returns:
+            AnalysisState: The current snapshot (possibly unchanged after a timeout)
+        """
+        if previous is not None:
+            with self._state_changed:
+                self._state_changed.wait_for(lambda: self._state is not previous, timeout)
+        return self.get_state()
+
     def get_status(self) -> str:
         """
-        Get the current analysis status.
+        Get the current analysis status without blocking on a running analysis.
         
         Returns:
             str: Current status ('idle', 'analyzing', 'complete', 'error')
         """
-        return self.analysis_status
+        return self.get_state().status
 
+    @_cached_per_epoch
     def get_all_queries(self) -> List[str]:
         """
         Get all generated query strings (for compatibility with frontend).
@@ -111,6 +418,7 @@ class Analyzer:
         """
         return self.generated_queries
 
+    @_cached_per_epoch
     def get_query_types_summary(self) -> Dict[str, Any]:
         """
         Get summary statistics about query types.
@@ -143,124 +451,233 @@ class Analyzer:
         Returns:
             Optional[Dict[str, Any]]: Query details including Gemini response and domain stats
         """
+        return self._details_index.get(query)
+
+    def get_query_details_json(self, query: str) -> Optional[bytes]:
+        """
+        Get the query details serialized once per analysis.
+        
+        Args:
+            query (str): The query string to get details for
+            
+        Returns:
+            Optional[bytes]: UTF-8 JSON encoding of get_query_details(query), or None if the query is unknown
+        """
+        # Check first so lookups of unknown queries are not memoized
+        if query not in self._details_index:
+            return None
+        return self._query_details_json(query)
+
+    @_cached_per_epoch
+    def _query_details_json(self, query: str) -> bytes:
+        return orjson.dumps(self._details_index[query])
+
+    def _invalidate_result_caches(self):
+        """
+        Drop every index and aggregation derived from the previous analysis results.
+        """
+        self._details_index = {}
+        self._results_epoch += 1
+        self._agg_cache.clear()
+
+    def _materialize_results(self):
+        """
+        Build everything the result endpoints serve, before the analysis is marked complete.
+        
+        Runs the single aggregation pass, then encodes and pre-compresses the
+        aggregate-results payload (and its ETag) and encodes every query's
+        details, so the first request after completion is served from memory
+        like every later one.
+        """
+        self._precompute_aggregates()
+        self._aggregate_response()  # builds and caches the payload bytes, compressed variants and ETag
+        # Grounding metadata is the bulk of each query's details; walk it once here,
+        # then /api/query-details and the batch endpoint only splice the bytes
+        for query in self._details_index:
+            self._query_details_json(query)
+
+    def _precompute_aggregates(self):
+        """
+        Build every per-domain tally, and the per-query details index, in one
+        pass over the analysis results.
+        
+        The reporting methods only format and sort these counters, so the
+        links of each result are walked once per analysis instead of once per view.
+        """
+        details_index = {}
+        link_counts = Counter()
+        query_counts = Counter()
+        type_counts = defaultdict(lambda: {'direct': 0, 'generic': 0, 'total': 0})
+        is_direct = {
+            query_obj.get('query', ''): query_obj.get('type', 'Generic').lower() == 'direct'
+            for query_obj in self.generated_queries
+        }
+        
+        # DomainAnalyzer always sets 'query'/'links' on results and 'domain'/'count'
+        # on links, so the hot loop indexes directly instead of calling .get().
+        # Domains are interned on the way through so every result and counter
+        # shares one string object per domain (results loaded from disk included).
         for result in self.analysis_results:
-            if result['query'] == query:
-                return {
-                    'query': result['query'],
-                    'query_type': result.get('query_type', 'Generic'),  # Include query type
-                    'gemini_response': result['complete_result']['response_text'] if result['complete_result'] else '',
+            query = result['query']
+            direct = is_direct.get(query)  # None if not a generated query
+            
+            if query not in details_index:  # first match wins
+                complete_result = result['complete_result'] or {}
+                details_index[query] = {
+                    'query': query,
+                    'query_type': result.get('query_type', 'Generic'),
+                    'gemini_response': complete_result.get('response_text', ''),
                     'domains': result['links'],
-                    'grounding_metadata': result['complete_result']['grounding_metadata'] if result['complete_result'] else []
+                    'grounding_metadata': complete_result.get('grounding_metadata', [])
                 }
-        return None
+            
+            # 'links' holds one entry per domain (see DomainAnalyzer.count_domains),
+            # so every link counts the domain once for this query
+            for link in result['links']:
+                domain = link['domain']
+                if not domain:
+                    continue
+                link['domain'] = domain = sys.intern(domain)
+                link_counts[domain] += link['count']
+                query_counts[domain] += 1
+                
+                if direct is None:
+                    continue
+                counts = type_counts[domain]
+                if direct:
+                    counts['direct'] += 1
+                else:
+                    counts['generic'] += 1
+                counts['total'] += 1
+        
+        self._details_index = details_index
+        self._domain_link_counts = link_counts
+        self._domain_query_counts = query_counts
+        self._domain_type_counts = dict(type_counts)
+
+    @staticmethod
+    def _with_percentages(rows: List[Dict[str, Any]], total: int, fields: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Attach rounded percentages to count rows.
+        
+        Args:
+            rows (List[Dict[str, Any]]): Count rows, already sorted
+            total (int): The denominator (number of queries)
+            fields (Dict[str, str]): Maps each count field to the percentage field derived from it
+            
+        Returns:
+            List[Dict[str, Any]]: Copies of the rows with the percentage fields added
+        """
+        return [
+            dict(row, **{pct_field: round((row[count_field] / total) * 100, 1) for count_field, pct_field in fields.items()})
+            for row in rows
+        ]
+
+    @_cached_per_epoch
+    def get_domain_counts(self, top_k: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the number of queries each domain appears in, without percentages.
+        
+        Args:
+            top_k (Optional[int]): Only return the top_k domains. Defaults to all domains.
+        
+        Returns:
+            Dict[str, Any]: {'total_queries': int, 'rows': [{'domain': str, 'query_count': int}, ...]}
+            with rows sorted by query_count (descending)
+        """
+        return {
+            'total_queries': len(self.analysis_results),
+            'rows': [
+                {'domain': domain, 'query_count': query_count}
+                for domain, query_count in self._domain_query_counts.most_common(top_k)
+            ]
+        }
 
-    def get_percentage_analysis(self) -> Dict[str, Any]:
+    @_cached_per_epoch
+    def get_percentage_analysis(self, top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Get percentage-based analysis showing which domains appear in what percentage of queries.
         
+        Args:
+            top_k (Optional[int]): Only return the top_k domains. Defaults to all domains.
+        
         Returns:
             Dict[str, Any]: Aggregated results with percentages
         """
         if not self.analysis_results:
             return {'numOfQueries': 0, 'domainPercentages': []}
         
-        total_queries = len(self.analysis_results)
-        domain_query_appearances = defaultdict(set)  # Track which queries each domain appears in
-        
-        # Track domain appearances per query
-        for idx, result in enumerate(self.analysis_results):
-            links = result.get('links', [])
-            for link in links:
-                domain = link.get('domain', '')
-                if domain:
-                    domain_query_appearances[domain].add(idx)
-        
-        # Calculate percentages
-        domain_percentages = []
-        for domain, query_indices in domain_query_appearances.items():
-            percentage = (len(query_indices) / total_queries) * 100
-            domain_percentages.append({
-                'domain': domain,
-                'percentage': round(percentage, 1),
-                'query_count': len(query_indices)
-            })
-        
-        # Sort by percentage (descending)
-        domain_percentages.sort(key=lambda x: (-x['percentage']))
+        counts = self.get_domain_counts(top_k)
+        total_queries = counts['total_queries']
         
         return {
             'numOfQueries': total_queries,
-            'domainPercentages': domain_percentages
+            'domainPercentages': self._with_percentages(counts['rows'], total_queries, {'query_count': 'percentage'})
         }
     
-    def get_domain_breakdown_by_type(self) -> List[Dict[str, Any]]:
+    @_cached_per_epoch
+    def get_domain_counts_by_type(self, top_k: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get direct vs generic query counts for each domain, without percentages.
+        
+        Args:
+            top_k (Optional[int]): Only return the top_k domains. Defaults to all domains.
+        
+        Returns:
+            Dict[str, Any]: {'total_queries': int, 'rows': [{'domain': str, 'direct_count': int,
+            'generic_count': int, 'total_count': int}, ...]} with rows sorted by total_count (descending)
+        """
+        rows = [
+            {
+                'domain': domain,
+                'direct_count': counts['direct'],
+                'generic_count': counts['generic'],
+                'total_count': counts['total']
+            }
+            for domain, counts in self._domain_type_counts.items()
+        ]
+        by_total = operator.itemgetter('total_count')
+        if top_k is None:
+            rows.sort(key=by_total, reverse=True)
+        else:
+            rows = heapq.nlargest(top_k, rows, key=by_total)
+        
+        return {
+            'total_queries': len(self.generated_queries),
+            'rows': rows
+        }
+
+    @_cached_per_epoch
+    def get_domain_breakdown_by_type(self, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get domain breakdown showing direct vs generic query counts for each domain.
         
+        Args:
+            top_k (Optional[int]): Only return the top_k domains. Defaults to all domains.
+        
         Returns:
             List[Dict[str, Any]]: List of domains with their direct/generic breakdown
         """
         if not self.generated_queries:
             return []
         
-        # Count domain occurrences by query type
-        domain_type_counts = defaultdict(lambda: {'direct': 0, 'generic': 0, 'total': 0})
-        
-        for query_obj in self.generated_queries:
-            query = query_obj.get('query', '')
-            query_type = query_obj.get('type', 'Generic').lower()
-            
-            # Find corresponding analysis result
-            result = next((r for r in self.analysis_results if r.get('query') == query), None)
-            if not result:
-                continue
-                
-            # Get domains from this query result
-            links = result.get('links', [])
-            domains_in_query = set()
-            
-            for link in links:
-                domain = link.get('domain', '')
-                if domain:
-                    domains_in_query.add(domain)
-            
-            # Count each domain once per query
-            for domain in domains_in_query:
-                if query_type == 'direct':
-                    domain_type_counts[domain]['direct'] += 1
-                else:
-                    domain_type_counts[domain]['generic'] += 1
-                domain_type_counts[domain]['total'] += 1
-        
-        # Convert to list with percentages
-        total_queries = len(self.generated_queries)
-        domain_breakdown = []
-        
-        for domain, counts in domain_type_counts.items():
-            direct_percentage = (counts['direct'] / total_queries) * 100
-            generic_percentage = (counts['generic'] / total_queries) * 100
-            total_percentage = (counts['total'] / total_queries) * 100
-            
-            domain_breakdown.append({
-                'domain': domain,
-                'direct_count': counts['direct'],
-                'generic_count': counts['generic'],
-                'total_count': counts['total'],
-                'direct_percentage': round(direct_percentage, 1),
-                'generic_percentage': round(generic_percentage, 1),
-                'total_percentage': round(total_percentage, 1)
-            })
-        
-        # Sort by total percentage (descending)
-        domain_breakdown.sort(key=lambda x: (-x['total_percentage']))
+        counts = self.get_domain_counts_by_type(top_k)
         
-        return domain_breakdown
+        return self._with_percentages(counts['rows'], counts['total_queries'], {
+            'direct_count': 'direct_percentage',
+            'generic_count': 'generic_percentage',
+            'total_count': 'total_percentage'
+        })
     
 
-    def aggregateResults(self) -> Dict[str, Any]:
+    @_cached_per_epoch
+    def aggregateResults(self, top_k: Optional[int] = None) -> Dict[str, Any]:
         """
         Aggregates the analysis results.
 
+        Args:
+            top_k (Optional[int]): Only return the top_k domains by count. Defaults to all domains.
+
         Returns:
             Dict[str, Any]: The aggregated analysis results in the format:
             {
@@ -274,29 +691,20 @@ class Analyzer:
                 ]
             }
         """
-        total_domain_counts = defaultdict(int)
-        
-        for result in self.analysis_results:
-            # Extract domain counts from each query result
-            links = result.get('links', [])
-            for link in links:
-                domain = link.get('domain', '')
-                count = link.get('count', 0)
-                if domain:
-                    total_domain_counts[domain] += count
-        
-        # Sort domains by total count (descending)
-        sorted_domains = sorted(
-            total_domain_counts.items(),
-            key=lambda x: (-x[1])
-        )
+        # Sort domains by total count (descending). Ranking the keys directly
+        # avoids building an intermediate list of (domain, count) tuples.
+        link_counts = self._domain_link_counts
+        if top_k is None:
+            sorted_domains = sorted(link_counts, key=link_counts.__getitem__, reverse=True)
+        else:
+            sorted_domains = heapq.nlargest(top_k, link_counts, key=link_counts.__getitem__)
         
         total_link_counts = [
             {
                 'domain': domain,
-                'count': count
+                'count': link_counts[domain]
             }
-            for domain, count in sorted_domains
+            for domain in sorted_domains
         ]
         
         return {
@@ -304,6 +712,82 @@ class Analyzer:
             'totalLinkCounts': total_link_counts
         }
 
+    @_cached_per_epoch
+    def get_aggregate_results(self) -> Dict[str, Any]:
+        """
+        Build the complete aggregate-results payload served to the frontend.
+        
+        Returns:
+            Dict[str, Any]: URL, queries, query type summary, domain percentages and breakdown
+        """
+        percentage_data = self.get_percentage_analysis()
+        return {
+            'status': 'complete',
+            'url': self.url,
+            'queries': self.get_all_queries(),
+            'queries_structured': self.get_all_queries_structured(),
+            'query_types': self.get_query_types_summary(),
+            'domain_percentages': percentage_data['domainPercentages'],
+            'domain_breakdown': self.get_domain_breakdown_by_type(),
+            'num_queries': percentage_data['numOfQueries']
+        }
+
+    @_cached_per_epoch
+    def get_aggregate_results_json(self) -> bytes:
+        """
+        Get the aggregate-results payload serialized once per analysis.
+        
+        Returns:
+            bytes: UTF-8 JSON encoding of get_aggregate_results()
+        """
+        return orjson.dumps(self.get_aggregate_results())
+
+    @_cached_per_epoch
+    def get_aggregate_results_encoded(self) -> Dict[str, bytes]:
+        """
+        Get the aggregate-results payload compressed once per analysis.
+        
+        Returns:
+            Dict[str, bytes]: Content-Encoding name -> compressed get_aggregate_results_json()
+        """
+        return contentEncoding.encode_all(self.get_aggregate_results_json())
+
+    def get_completed_aggregate(self) -> Optional[Tuple[bytes, str, Dict[str, bytes]]]:
+        """
+        Get the serialized aggregate results, their ETag and compressed variants in one read.
+        
+        Status, payload and ETag come from a single state snapshot and a single
+        memo entry, so a request never pairs bytes with another epoch's ETag.
+        
+        Returns:
+            Optional[Tuple[bytes, str, Dict[str, bytes]]]: (payload bytes, ETag, encoding -> compressed bytes),
+                or None unless the analysis is complete
+        """
+        if self.get_state().status != "complete":
+            return None
+        return self._aggregate_response()
+
+    @_cached_per_epoch
+    def _aggregate_response(self) -> Tuple[bytes, str, Dict[str, bytes]]:
+        return (
+            self.get_aggregate_results_json(),
+            self.get_aggregate_results_etag(),
+            self.get_aggregate_results_encoded()
+        )
+
+    @_cached_per_epoch
+    def get_aggregate_results_etag(self) -> str:
+        """
+        Get an ETag for the aggregate-results payload.
+        
+        Derived from the serialized bytes, so it only changes when the payload
+        does (also across resets and demo reloads).
+        
+        Returns:
+            str: Hex digest of get_aggregate_results_json()
+        """
+        return hashlib.blake2b(self.get_aggregate_results_json(), digest_size=16).hexdigest()
+
 
     def _save_demo_data(self, url: str, queries_to_run: int):
         """
@@ -323,8 +807,7 @@ class Analyzer:
                 'saved_at': time.strftime('%Y-%m-%d %H:%M:%S')
             }
 
-            with open(self.demo_save_file, 'w', encoding='utf-8') as f:
-                json.dump(demo_data, f, indent=2, ensure_ascii=False)
+            save_json(self.demo_save_file, demo_data)
             
             print(f"Demo data saved to {self.demo_save_file}")
             
@@ -349,8 +832,7 @@ class Analyzer:
                 print("No demo data file found")
                 return False
             
-            with open(self.demo_save_file, 'r', encoding='utf-8') as f:
-                demo_data = json.load(f)
+            demo_data = load_json(self.demo_save_file)
             
             # Simulate some processing time for realism 
             print("Loading demo data...")
@@ -361,6 +843,8 @@ class Analyzer:
             self.queriesToRun = queries_to_run if queries_to_run else demo_data.get('queries_to_run', self.queriesToRun)
             self.generated_queries = demo_data.get('generated_queries', [])
             self.analysis_results = demo_data.get('analysis_results', [])
+            self._invalidate_result_caches()
+            self._materialize_results()
             
             saved_at = demo_data.get('saved_at', 'unknown time')
             print(f"Demo data loaded successfully (saved at {saved_at})")
@@ -0,0 +1,229 @@
+"""
+Holder for the analyses the API serves: every started analysis by job id, the
+current one, and recently completed analyses by URL.
+
+Several analyses may run at once (up to MAX_RUNNING_ANALYSES); each gets a job
+id that clients pass to the result endpoints. Starting an analysis that is
+already running joins it, and starting one that completed within the last
+COMPLETED_ANALYSES_TTL_SECONDS reuses the finished analyzer instead of
+re-crawling and re-querying Gemini. Only runs that produced results are kept
+for reuse (a failed crawl yields no queries and is retried on the next start),
+and force_refresh or a reset drops the kept analysis. All changes go through
+one lock, so concurrent start/reset requests cannot interleave.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+from analyzer import Analyzer
+from asyncCache import url_cache_key
+
+COMPLETED_ANALYSES_MAX = 8  # finished analyses kept for reuse
+COMPLETED_ANALYSES_TTL_SECONDS = 60 * 60  # how long a finished analysis is reused
+JOBS_MAX = 16  # analyzers kept reachable by job id (running ones are never dropped)
+MAX_RUNNING_ANALYSES = int(os.environ.get('MAX_RUNNING_ANALYSES', 2))
+
+
+class AnalyzerRegistry:
+    """
+    Thread-safe owner of the current Analyzer and the completed-analysis cache.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Analyzer],
+        max_completed: int = COMPLETED_ANALYSES_MAX,
+        max_running: int = MAX_RUNNING_ANALYSES,
+        max_jobs: int = JOBS_MAX,
+        completed_ttl: float = COMPLETED_ANALYSES_TTL_SECONDS
+    ):
+        """
+        Initialize the registry. The first analyzer is created on first use.
+
+        Args:
+            factory: Creates a new, idle Analyzer.
+            max_completed: Maximum number of completed analyses kept for reuse.
+            max_running: Maximum number of analyses running at once.
+            max_jobs: Maximum number of analyzers kept reachable by job id.
+            completed_ttl: Seconds a completed analysis is reused for.
+        """
+        self._factory = factory
+        self.max_completed = max_completed
+        self.max_running = max_running
+        self.max_jobs = max_jobs
+        self.completed_ttl = completed_ttl
+        self._lock = threading.Lock()
+        self._current: Optional[Analyzer] = None
+        self._completed: "OrderedDict[Tuple[str, int], Tuple[Analyzer, float]]" = OrderedDict()  # -> (analyzer, completed at)
+        self._running: Dict[Tuple[str, int], Analyzer] = {}
+        self._jobs: "OrderedDict[str, Analyzer]" = OrderedDict()
+
+    @property
+    def current(self) -> Analyzer:
+        """The most recently started (or reused) analyzer; served when a request names no job."""
+        current = self._current
+        if current is not None:
+            return current
+        with self._lock:
+            return self._current_locked()
+
+    def _current_locked(self) -> Analyzer:
+        """The current analyzer, created if needed; the caller holds _lock."""
+        if self._current is None:
+            self._current = self._factory()
+        return self._current
+
+    def get(self, job_id: str) -> Optional[Analyzer]:
+        """
+        Get the analyzer of a job.
+
+        Args:
+            job_id: Id returned by start (AnalysisState.job_id).
+
+        Returns:
+            Optional[Analyzer]: The analyzer, or None if the job is unknown or no longer kept.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def reset(self) -> Analyzer:
+        """
+        Cancel the current analysis (if running) and replace the analyzer with a fresh one.
+
+        If the current analyzer was kept for reuse, it is dropped, so starting
+        the same analysis again runs it anew. Other running jobs and completed
+        analyses are left alone.
+
+        Returns:
+            Analyzer: The new current analyzer.
+        """
+        with self._lock:
+            previous = self._current
+            if previous is not None:
+                self._evict_completed(previous)
+            self._current = self._factory()
+            current = self._current
+        # Outside the lock: cancelling runs the analysis' done-callbacks (_remember) in this thread
+        if previous is not None:
+            previous.cancel_analysis()
+        return current
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a running job.
+
+        Args:
+            job_id: Id returned by start.
+
+        Returns:
+            bool: True if the job was running and has been cancelled.
+        """
+        analyzer = self.get(job_id)
+        return analyzer is not None and analyzer.cancel_analysis()
+
+    def start(self, url: str, queries_to_run: int, force_refresh: bool = False) -> Tuple[Analyzer, bool]:
+        """
+        Start an analysis, or join/reuse one for the same URL and query count.
+
+        The analyzer returned becomes the current one.
+
+        Args:
+            url: The URL to analyze.
+            queries_to_run: Number of queries to generate.
+            force_refresh: Drop any completed analysis for the URL and query count and run it again.
+
+        Returns:
+            Tuple[Analyzer, bool]: The analyzer, and whether a completed analysis was reused.
+
+        Raises:
+            RuntimeError: If max_running other analyses are already running.
+        """
+        key = (url_cache_key(url), queries_to_run)
+        with self._lock:
+            if force_refresh:
+                self._completed.pop(key, None)
+            cached = self._fresh_completed(key)
+            if cached is not None:
+                self._completed.move_to_end(key)
+                self._current = cached
+                return cached, True
+
+            running = self._running.get(key)
+            if running is not None:
+                self._current = running
+                return running, False
+
+            if len(self._running) >= self.max_running:
+                raise RuntimeError(f"{len(self._running)} analyses are already running; try again when one finishes")
+
+            analyzer = self._factory()
+            future = analyzer.submit_analysis(url, saveResults=True, queriesToRun=queries_to_run)
+            self._running[key] = analyzer
+            self._jobs[analyzer.get_state().job_id] = analyzer
+            self._trim_jobs()
+            self._current = analyzer
+        # Outside the lock: the callback takes it, and runs right away if the analysis already ended
+        future.add_done_callback(lambda done: self._remember(key, analyzer, done))
+        return analyzer, False
+
+    def completed_for(self, url: str) -> Optional[Analyzer]:
+        """
+        Get the most recently used completed analysis of a URL.
+
+        Args:
+            url: The analyzed URL (any spelling that normalizes to the same key).
+
+        Returns:
+            Optional[Analyzer]: The analyzer holding the results, or None.
+        """
+        url_key = url_cache_key(url)
+        with self._lock:
+            for key in reversed(self._completed):
+                if key[0] == url_key:
+                    analyzer = self._fresh_completed(key)
+                    if analyzer is not None:
+                        return analyzer
+        return None
+
+    def _fresh_completed(self, key: Tuple[str, int]) -> Optional[Analyzer]:
+        """The completed analysis for key, dropped if it expired; the caller holds _lock."""
+        entry = self._completed.get(key)
+        if entry is None:
+            return None
+        analyzer, completed_at = entry
+        if time.monotonic() - completed_at > self.completed_ttl:
+            del self._completed[key]
+            return None
+        return analyzer
+
+    def _evict_completed(self, analyzer: Analyzer):
+        """Stop reusing analyzer for any key; the caller holds _lock."""
+        for key in [key for key, (kept, _) in self._completed.items() if kept is analyzer]:
+            del self._completed[key]
+
+    def _trim_jobs(self):
+        """Drop the oldest finished jobs beyond max_jobs; the caller holds _lock."""
+        running = set(map(id, self._running.values()))
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if id(self._jobs[job_id]) not in running:
+                del self._jobs[job_id]
+
+    def _remember(self, key: Tuple[str, int], analyzer: Analyzer, future: Future):
+        """Done-callback of an analysis: stop counting it as running, and keep it for reuse if it produced results."""
+        with self._lock:
+            if self._running.get(key) is analyzer:
+                del self._running[key]
+            if future.cancelled() or future.exception() is not None:
+                return
+            if not future.result() or not analyzer.generated_queries:
+                return  # e.g. the crawl failed and no queries were generated; retried on the next start
+            self._completed[key] = (analyzer, time.monotonic())
+            self._completed.move_to_end(key)
+            while len(self._completed) > self.max_completed:
+                self._completed.popitem(last=False)
@@ -10,29 +10,164 @@ This API provides endpoints for the 4-page frontend:
 5. Structure analysis results
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
+from collections import OrderedDict
+import concurrent.futures
+import functools
+import hashlib
+from pathlib import Path
+import orjson
+from pydantic import ValidationError
 import threading
 import time
-import asyncio
-import json
+from typing import Optional, Tuple
 
 
 import os #imports for demo only
 import time #imports for demo only
 
 from analyzer import Analyzer
+from analyzerRegistry import AnalyzerRegistry
+from contentEncoding import negotiate
+from jobStore import JobStore
+from logConfig import configure_logging
+from reportStorage import REPORTS_DIR, load_json, save_json
+from eventLoop import run_coroutine, submit
+from apiModels import (
+    AggregateResultsParams,
+    AnalyzeStructureParams,
+    AnalyzeStructureRequest,
+    BatchRequest,
+    JobParams,
+    QueryDetailsBatchRequest,
+    QueryDetailsRequest,
+    StartAnalysisParams,
+    StartAnalysisRequest,
+    StartAnalysisResponse,
+    StatusResponse,
+    StructureLookupParams,
+    format_validation_error,
+)
 
 import structureAnalyzer
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson, so jsonify() and request.get_json() skip the stdlib encoder.
+    
+    Responses are compact and keep insertion order (no sort_keys).
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    sort_keys = False
+    compact = True
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
+MAX_REQUEST_BODY_BYTES = 1024 * 1024
+
+def validate_body(model):
+    """
+    Validate the request's JSON body against a pydantic model before calling the view.
+    
+    The view receives the validated model as its first argument; invalid or
+    missing bodies are answered with 400 and a short error message.
+    
+    Args:
+        model: pydantic BaseModel subclass describing the body
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                # Parse and validate the raw bytes in one step in pydantic's core; the
+                # bytes are not cached on the request, since nothing reads them again
+                body = model.model_validate_json(request.get_data(cache=False) or b'{}')
+            except ValidationError as e:
+                return jsonify({'error': format_validation_error(e)}), 400
+            return view(body, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def validate_args(model):
+    """
+    Validate the request's query string against a pydantic model before calling the view.
+    
+    The view receives the validated model as the 'params' keyword argument;
+    invalid values are answered with 400 and a short error message.
+    
+    Args:
+        model: pydantic BaseModel subclass describing the query parameters
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                params = model.model_validate(request.args.to_dict())
+            except ValidationError as e:
+                return jsonify({'error': format_validation_error(e)}), 400
+            return view(*args, params=params, **kwargs)
+        return wrapper
+    return decorator
+
+configure_logging()
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for frontend communication
 
+# Compress JSON responses above 500 bytes (zstd, Brotli or gzip, whichever the client
+# prefers); streamed responses (query details) are compressed chunk by chunk.
+# Aggregate results are pre-compressed once per analysis and skipped here.
+app.config['COMPRESS_ALGORITHM'] = ['zstd', 'br', 'gzip']
+app.config['COMPRESS_ZSTD_LEVEL'] = 3
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_MIN_SIZE'] = 500
+app.config['COMPRESS_STREAMS'] = True
+Compress(app)
+
+# Request bodies are small JSON documents; refuse anything larger before reading
+# it, so oversized input is rejected without being buffered or parsed
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BODY_BYTES
+
 DEMO_MODE = False  # Enable demo mode if True
 
-# Global analyzer instance 
-analyzer = Analyzer(demo_mode=DEMO_MODE)
-analysis_thread = None
+STRUCTURE_ANALYSIS_TIMEOUT_SECONDS = 120  # crawl + Gemini call for /api/analyze-structure
+
+# URL -> (structure result, serialized response body, ETag), see _structure_response_json
+STRUCTURE_RESPONSES_MAX = 32
+_structure_responses: "OrderedDict[str, Tuple[dict, bytes, str]]" = OrderedDict()
+_structure_responses_lock = threading.Lock()
+
+# (mtime_ns, parsed result) of the demo structure file, see _load_demo_structure
+_demo_structure: Optional[Tuple[int, dict]] = None
+
+# Comma-separated URLs whose structure analysis is run at startup, so the first
+# /api/analyze-structure request for them is answered from the cache
+POPULAR_URLS = [url.strip() for url in os.environ.get('POPULAR_URLS', '').split(',') if url.strip()]
+
+# Analyses started through the API, kept across restarts and analyzer resets
+job_store = JobStore(REPORTS_DIR / 'jobs.sqlite')
+
+# Owns the analyzer the endpoints report on, plus recently completed analyses by URL
+registry = AnalyzerRegistry(lambda: Analyzer(demo_mode=DEMO_MODE, job_store=job_store))
+
+if POPULAR_URLS and not DEMO_MODE:
+    submit(structureAnalyzer.prewarm_structure_cache(POPULAR_URLS))  # runs in the background
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -40,7 +175,9 @@ def health_check():
     return jsonify({'status': 'healthy', 'message': 'API is running'}), 200
 
 @app.route('/api/start-analysis', methods=['POST'])
-def start_analysis():
+@validate_body(StartAnalysisRequest)
+@validate_args(StartAnalysisParams)
+def start_analysis(body: StartAnalysisRequest, params: StartAnalysisParams):
     """
     Start analysis for a given URL.
     
@@ -55,83 +192,198 @@ def start_analysis():
         "status": "started",
         "message": "Analysis started for URL",
         "url": "https://example.com",
-        "numOfQueries": 8
+        "numOfQueries": 8,
+        "job_id": "..."  // pass as ?job_id=... to the status and result endpoints; also /api/jobs/<job_id>
     }
-    """
-    global analysis_thread, analyzer
     
+    If the same URL was analyzed with the same number of queries within the
+    last hour (and the run produced results), that analysis is reused: "status"
+    is "complete" and "cached" is true. Add ?force_refresh=1 to run it again.
+    If it is still running, the running job is returned. Up to
+    MAX_RUNNING_ANALYSES analyses run at once; beyond that the answer is 429.
+    """
     try:
-        data = request.get_json()
-        if not data or 'url' not in data:
-            return jsonify({'error': 'URL is required in request body'}), 400
-        
-        url = data['url'].strip()
-        if not url:
-            return jsonify({'error': 'URL cannot be empty'}), 400
+        url = body.url
         
         # Get number of queries (optional, default to current setting)
-        num_queries = data.get('numOfQueries', analyzer.queriesToRun)
+        num_queries = body.numOfQueries if body.numOfQueries is not None else registry.current.queriesToRun
         
-        if not isinstance(num_queries, int) or num_queries < 1 or num_queries > 50:
-            return jsonify({'error': 'numOfQueries must be an integer between 1 and 50'}), 400
+        # Schedule the analysis on the shared background event loop (or reuse a finished one)
+        try:
+            analyzer, cached = registry.start(url, num_queries, force_refresh=params.force_refresh)
+        except RuntimeError as e:
+            return jsonify({'error': str(e)}), 429
         
-        # Check if analysis is already running
-        if analyzer.get_status() == 'analyzing':
-            return jsonify({'error': 'Analysis is already running'}), 409
-        
-        # Update the number of queries in the analyzer
-        analyzer.queriesToRun = num_queries
-        
-        # Start analysis in background thread
-        def run_analysis():
-            try:
-                analyzer.run_analysis(url, saveResults=True)
-            except Exception as e:
-                print(f"Analysis failed: {e}")
-        
-        analysis_thread = threading.Thread(target=run_analysis)
-        analysis_thread.start()
-        
-        return jsonify({
-            'status': 'started',
-            'message': f'Analysis started for URL: {url}',
-            'url': url,
-            'numOfQueries': num_queries
-        }), 200
+        return jsonify(StartAnalysisResponse(
+            status='complete' if cached else 'started',
+            message=f'Reusing completed analysis for URL: {url}' if cached else f'Analysis started for URL: {url}',
+            url=url,
+            numOfQueries=num_queries,
+            job_id=analyzer.get_state().job_id or None,
+            cached=cached
+        )), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to start analysis: {str(e)}'}), 500
 
+def _status_payload(state) -> StatusResponse:
+    """Build the /api/status response body from an AnalysisState snapshot."""
+    return StatusResponse(
+        status=state.status,
+        url=state.url,
+        num_queries=state.num_queries if state.status in ['complete', 'analyzing'] else 0,
+        queries_done=state.queries_done if state.status in ['complete', 'analyzing'] else 0,
+        queries_to_run=state.queries_to_run,
+        job_id=state.job_id or None
+    )
+
+@functools.lru_cache(maxsize=32)
+def _status_json(state) -> bytes:
+    """
+    Serialized _status_payload(state).
+    
+    AnalysisState snapshots are immutable and hashable, so polls that see the
+    same state reuse the same bytes, and any state change is a new cache key.
+    """
+    return orjson.dumps(_status_payload(state))
+
+def _job_analyzer(job_id: Optional[str]) -> Optional[Analyzer]:
+    """
+    Get the analyzer a request refers to.
+    
+    Args:
+        job_id: The request's job_id parameter, or None for the current analysis
+        
+    Returns:
+        Optional[Analyzer]: The analyzer, or None if the job is unknown or no longer kept
+    """
+    return registry.current if job_id is None else registry.get(job_id)
+
+def _job_not_found():
+    return jsonify({'error': 'Job not found (unknown id, or no longer kept in memory)'}), 404
+
 @app.route('/api/status', methods=['GET'])
-def get_analysis_status():
+@validate_args(JobParams)
+def get_analysis_status(params: JobParams):
     """
-    Get current analysis status.
+    Get analysis status.
+    
+    Add ?job_id=... to follow a specific analysis; without it the most
+    recently started one is reported.
     
     Returns:
     {
         "status": "idle" | "analyzing" | "complete" | "error",
         "url": "current_url",
         "num_queries": number_of_queries_generated,
-        "queries_to_run": number_of_queries_configured
+        "queries_done": number_of_queries_analyzed,
+        "queries_to_run": number_of_queries_configured,
+        "job_id": "..." | null  // job of the current or last analysis
     }
     """
     try:
-        status = analyzer.get_status()
-        return jsonify({
-            'status': status,
-            'url': analyzer.url,
-            'num_queries': len(analyzer.get_all_queries()) if status in ['complete', 'analyzing'] else 0,
-            'queries_to_run': analyzer.queriesToRun
-        }), 200
+        analyzer = _job_analyzer(params.job_id)
+        if analyzer is None:
+            return _job_not_found()
+        return Response(_status_json(analyzer.get_state()), mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': f'Failed to get status: {str(e)}'}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """
+    Look up an analysis job by the id returned from /api/start-analysis.
+    
+    Job records outlive /api/reset and server restarts; jobs that were running
+    when the server stopped are reported as errors.
+    
+    Returns:
+    {
+        "id": "...",
+        "url": "https://example.com",
+        "num_queries": 8,
+        "status": "analyzing" | "complete" | "error" | "cancelled",
+        "error": null | "message",
+        "created_at": unix_seconds,
+        "updated_at": unix_seconds
+    }
+    """
+    try:
+        job = job_store.get(job_id)
+        if job is None:
+            analyzer = registry.get(job_id)
+            if analyzer is None:
+                return jsonify({'error': 'Job not found'}), 404
+            # Just started: the task writes the row moments after start-analysis returns
+            state = analyzer.get_state()
+            job = {'id': job_id, 'url': state.url, 'num_queries': state.queries_to_run,
+                   'status': state.status, 'error': None, 'created_at': None, 'updated_at': None}
+        return jsonify(job), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get job: {str(e)}'}), 500
+
+STATUS_STREAM_HEARTBEAT_SECONDS = 5
+
+def _sse_event(event: str, data: bytes) -> bytes:
+    return b'event: ' + event.encode() + b'\ndata: ' + data + b'\n\n'
+
+@app.route('/api/status/stream', methods=['GET'])
+@app.route('/api/events', methods=['GET'])
+@validate_args(JobParams)
+def stream_analysis_status(params: JobParams):
+    """
+    Push analysis status over Server-Sent Events instead of polling /api/status.
+    Also served as /api/events. Takes the same ?job_id=... as /api/status.
+    
+    Events:
+        status:  same body as /api/status; sent on every change and at least
+                 every STATUS_STREAM_HEARTBEAT_SECONDS while analyzing
+        results: same body as /api/aggregate-results; sent once on completion
+        end:     sent last, once the analysis is no longer running; data is the final status name (e.g. "idle")
+    
+    The stream ends after the 'end' event. Connecting (or an EventSource
+    reconnecting) to an analysis that ended without results ('idle' after a
+    cancel or reset, or 'error') gets 204, which stops EventSource from
+    reconnecting; read the outcome from /api/status.
+    """
+    current = _job_analyzer(params.job_id)  # keep following this analysis even if /api/reset swaps it
+    if current is None:
+        return _job_not_found()
+    if current.get_state().status in ('idle', 'error'):
+        return Response(status=204)
+    
+    def generate():
+        yield b'retry: 5000\n\n'
+        state = None
+        while True:
+            state = current.wait_for_state_change(state, STATUS_STREAM_HEARTBEAT_SECONDS)
+            yield _sse_event('status', _status_json(state))
+            if state.status == 'analyzing':
+                continue
+            if state.status == 'complete':
+                yield _sse_event('results', current.get_aggregate_results_json())
+            yield _sse_event('end', orjson.dumps(state.status))
+            return
+    
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/aggregate-results', methods=['GET'])
-def get_aggregate_results():
+@validate_args(AggregateResultsParams)
+def get_aggregate_results(params: AggregateResultsParams):
     """
     Get aggregate analysis results for page 3.
     
+    Add ?job_id=... to read a specific analysis, or ?url=... to read a recently
+    completed analysis of that URL, instead of the current one.
+    
+    Responses carry an ETag; a request whose If-None-Match matches it gets 304.
+    
     Returns:
     {
         "status": "complete",
@@ -163,34 +415,51 @@ def get_aggregate_results():
     }
     """
     try:
-        if analyzer.get_status() != 'complete':
-            return jsonify({'error': 'Analysis not complete yet'}), 400
+        if params.url is not None:
+            analyzer = registry.completed_for(params.url)
+            if analyzer is None:
+                return jsonify({'error': 'No completed analysis for this URL'}), 404
+        else:
+            analyzer = _job_analyzer(params.job_id)
+            if analyzer is None:
+                return _job_not_found()
         
-        percentage_data = analyzer.get_percentage_analysis()
-        queries = analyzer.get_all_queries()
-        queries_structured = analyzer.get_all_queries_structured()
-        query_types = analyzer.get_query_types_summary()
-        domain_breakdown = analyzer.get_domain_breakdown_by_type()
+        aggregate = analyzer.get_completed_aggregate()
+        if aggregate is None:
+            return jsonify({'error': 'Analysis not complete yet'}), 400
         
-        return jsonify({
-            'status': 'complete',
-            'url': analyzer.url,
-            'queries': queries,
-            'queries_structured': queries_structured,
-            'query_types': query_types,  
-            'domain_percentages': percentage_data['domainPercentages'],
-            'domain_breakdown': domain_breakdown,
-            'num_queries': percentage_data['numOfQueries']
-        }), 200
+        # Built, serialized and compressed once per analysis; repeat polls reuse the
+        # same bytes, and clients revalidating with If-None-Match get a bodiless 304
+        payload, etag, encoded = aggregate
+        encoding = negotiate(request.accept_encodings)
+        # direct_passthrough hands the cached bytes to the server as-is (no re-encoding
+        # pass), and tells Flask-Compress to leave the response alone; Content-Length
+        # is still set from the bytes
+        response = Response(
+            encoded[encoding] if encoding else payload,
+            mimetype='application/json',
+            direct_passthrough=True
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+            etag = f'{etag}-{encoding}'  # each representation gets its own validator
+        response.vary.add('Accept-Encoding')
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({'error': f'Failed to get aggregate results: {str(e)}'}), 500
 
 @app.route('/api/query-details', methods=['POST'])
-def get_query_details():
+@validate_body(QueryDetailsRequest)
+@validate_args(JobParams)
+def get_query_details(body: QueryDetailsRequest, params: JobParams):
     """
     Get detailed results for a specific query (page 4).
     
+    Add ?job_id=... to read a specific analysis instead of the current one.
+    
     Expected JSON payload:
     {
         "query": "specific query text"
@@ -212,29 +481,128 @@ def get_query_details():
     }
     """
     try:
+        analyzer = _job_analyzer(params.job_id)
+        if analyzer is None:
+            return _job_not_found()
         if analyzer.get_status() != 'complete':
             return jsonify({'error': 'Analysis not complete yet'}), 400
         
-        data = request.get_json()
-        if not data or 'query' not in data:
-            return jsonify({'error': 'Query is required in request body'}), 400
-        
-        query = data['query']
-        query_details = analyzer.get_query_details(query)
+        query_details = analyzer.get_query_details_json(body.query)
         
         if not query_details:
             return jsonify({'error': 'Query not found in analysis results'}), 404
         
-        return jsonify(query_details), 200
+        return Response(query_details, mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': f'Failed to get query details: {str(e)}'}), 500
 
+@app.route('/api/query-details-batch', methods=['POST'])
+@validate_body(QueryDetailsBatchRequest)
+@validate_args(JobParams)
+def get_query_details_batch(body: QueryDetailsBatchRequest, params: JobParams):
+    """
+    Get detailed results for several queries in one request.
+    Takes the same ?job_id=... as /api/query-details.
+    
+    Expected JSON payload:
+    {
+        "queries": ["query text 1", "query text 2", ...]  // at most 50
+    }
+    
+    Returns:
+    {
+        "query text 1": { ...same shape as /api/query-details... },
+        "query text 2": null  // query not found in analysis results
+    }
+    """
+    try:
+        current = _job_analyzer(params.job_id)  # keep serving this analysis even if /api/reset swaps it mid-stream
+        if current is None:
+            return _job_not_found()
+        if current.get_status() != 'complete':
+            return jsonify({'error': 'Analysis not complete yet'}), 400
+        
+        # Splice each query's pre-serialized details into the object as it streams out
+        def generate():
+            yield b'{'
+            for i, query in enumerate(dict.fromkeys(body.queries)):
+                details = current.get_query_details_json(query)
+                yield (b',' if i else b'') + orjson.dumps(query) + b':' + (details if details is not None else b'null')
+            yield b'}'
+        
+        return Response(generate(), mimetype='application/json')
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get query details: {str(e)}'}), 500
+
+# Read-only endpoints that may be combined through /api/batch
+BATCHABLE_PATHS = frozenset({
+    '/api/health',
+    '/api/status',
+    '/api/aggregate-results',
+    '/api/query-details',
+    '/api/query-details-batch',
+})
+
+@app.route('/api/batch', methods=['POST'])
+@validate_body(BatchRequest)
+def batch(body: BatchRequest):
+    """
+    Run several read-only API calls in one round trip.
+    
+    Expected JSON payload:
+    {
+        "requests": [
+            {"path": "/api/status", "params": {"job_id": "..."}},  // params => query string
+            {"path": "/api/query-details", "body": {"query": "..."}}  // body => POST
+        ]
+    }
+    
+    Returns:
+    {
+        "responses": [
+            {"path": "/api/status", "status": 200, "body": {...}},
+            {"path": "/api/query-details", "status": 404, "body": {"error": "..."}}
+        ]
+    }
+    """
+    try:
+        for sub in body.requests:
+            if sub.path not in BATCHABLE_PATHS:
+                return jsonify({'error': f'Path cannot be batched: {sub.path}'}), 400
+        
+        parts = []
+        for sub in body.requests:
+            method = 'POST' if sub.body is not None else 'GET'
+            with app.test_request_context(sub.path, method=method, query_string=sub.params, json=sub.body):
+                response = app.full_dispatch_request()
+            # Each sub-response is already JSON bytes; splice them in without re-parsing.
+            # Anything else is never spliced, so the envelope stays valid JSON
+            if response.mimetype == 'application/json':
+                sub_body = response.get_data() or b'null'
+            else:
+                sub_body = orjson.dumps({'error': f'Non-JSON response ({response.mimetype or "no content type"})'})
+            parts.append(
+                b'{"path":' + orjson.dumps(sub.path)
+                + b',"status":' + str(response.status_code).encode()
+                + b',"body":' + sub_body + b'}'
+            )
+        
+        return Response(b'{"responses":[' + b','.join(parts) + b']}', mimetype='application/json')
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to run batch: {str(e)}'}), 500
+
 @app.route('/api/reset', methods=['POST'])
-def reset_analysis():
+@validate_args(JobParams)
+def reset_analysis(params: JobParams):
     """
     Reset the analyzer to start a new analysis.
     
+    With ?job_id=..., cancel that job instead (if it is still running); other
+    analyses keep running either way.
+    
     Returns:
     {
         "status": "reset",
@@ -242,8 +610,12 @@ def reset_analysis():
     }
     """
     try:
-        global analyzer
-        analyzer = Analyzer(demo_mode=DEMO_MODE)
+        if params.job_id is not None:
+            if registry.get(params.job_id) is None:
+                return _job_not_found()
+            registry.cancel(params.job_id)
+        else:
+            registry.reset()
 
         return jsonify({
             'status': 'reset',
@@ -253,8 +625,64 @@ def reset_analysis():
     except Exception as e:
         return jsonify({'error': f'Failed to reset analyzer: {str(e)}'}), 500
 
+def _structure_response_json(url: str, result: dict) -> Tuple[bytes, str, bool]:
+    """
+    Serialize the /api/analyze-structure success body, reusing the bytes (and their
+    ETag) while the structure cache keeps returning the same result for the URL.
+    
+    Args:
+        url: The URL as the client sent it (echoed in the body)
+        result: The structure analysis result
+        
+    Returns:
+        Tuple[bytes, str, bool]: The body, its ETag, and whether the result had not been serialized before
+    """
+    with _structure_responses_lock:
+        entry = _structure_responses.get(url)
+        if entry is not None and entry[0] is result:
+            _structure_responses.move_to_end(url)
+            return entry[1], entry[2], False
+    
+    payload = orjson.dumps({
+        'status': 'success',
+        'url': url,
+        'structure_analysis': result['structure_analysis'],
+        'structure_recommendations': result['structure_recommendations']
+    })
+    etag = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    with _structure_responses_lock:
+        _structure_responses[url] = (result, payload, etag)  # holding the result keeps the identity check valid
+        _structure_responses.move_to_end(url)
+        while len(_structure_responses) > STRUCTURE_RESPONSES_MAX:
+            _structure_responses.popitem(last=False)
+    return payload, etag, True
+
+def _load_demo_structure(path: Path) -> dict:
+    """
+    Load the demo structure analysis, parsing the file only when it changed.
+    
+    Returning the same dict while the file is unchanged lets
+    _structure_response_json serve the already-serialized body.
+    
+    Args:
+        path: The demo structure data file
+        
+    Returns:
+        dict: The parsed structure result
+    """
+    global _demo_structure
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _demo_structure
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    result = load_json(path)
+    _demo_structure = (mtime_ns, result)
+    return result
+
 @app.route('/api/analyze-structure', methods=['POST'])
-def analyze_structure():
+@validate_body(AnalyzeStructureRequest)
+@validate_args(AnalyzeStructureParams)
+def analyze_structure(body: AnalyzeStructureRequest, params: AnalyzeStructureParams):
     """
     Analyze website structure and get recommendations.
     
@@ -263,6 +691,10 @@ def analyze_structure():
         "url": "https://example.com"
     }
     
+    Add ?force_refresh=1 to ignore the cached analysis and crawl for the URL.
+    Responses carry an ETag. To revalidate a result without re-running
+    anything, use GET /api/analyze-structure?url=... with If-None-Match.
+    
     Returns:
     {
         "status": "success",
@@ -272,47 +704,87 @@ def analyze_structure():
     }
     """
     try:
-        data = request.get_json()
-        if not data or 'url' not in data:
-            return jsonify({'error': 'URL is required in request body'}), 400
-        
-        url = data['url'].strip()
-        if not url:
-            return jsonify({'error': 'URL cannot be empty'}), 400
+        url = body.url
 
-        structure_data_file = r'analysisReports\structure_data.json'
+        structure_data_file = REPORTS_DIR / 'structure_data.json'
 
         if DEMO_MODE == True:
             if not os.path.exists(structure_data_file):
                 return jsonify({'error': 'Demo data file not found'}), 500
-            with open(structure_data_file, 'r', encoding='utf-8') as f:
-                time.sleep(1)  # Simulate processing delay
-                result = json.load(f)
+            time.sleep(1)  # Simulate processing delay
+            result = _load_demo_structure(structure_data_file)
         else:   
             # Run the structure analysis
-            result = asyncio.run(structureAnalyzer.perform_structure_analysis(url))
-            with open(structure_data_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-            
+            # On the shared background loop, so crawler connections and DNS/TLS state carry over between requests
+            try:
+                result = run_coroutine(
+                    structureAnalyzer.perform_structure_analysis(url, params.force_refresh),
+                    timeout=STRUCTURE_ANALYSIS_TIMEOUT_SECONDS
+                )
+            except concurrent.futures.TimeoutError:
+                return jsonify({'error': f'Structure analysis timed out after {STRUCTURE_ANALYSIS_TIMEOUT_SECONDS} seconds'}), 504
         
         if result.get('error'):
+            if not DEMO_MODE:
+                save_json(structure_data_file, result)
             return jsonify({'error': result['error']}), 400
         
-        return jsonify({
-            'status': 'success',
-            'url': url,
-            'structure_analysis': result['structure_analysis'],
-            'structure_recommendations': result['structure_recommendations']
-        }), 200
+        payload, etag, is_new = _structure_response_json(url, result)
+        if is_new and not DEMO_MODE:
+            # Cache hits return the result that was already written
+            save_json(structure_data_file, result)
+        response = Response(payload, mimetype='application/json')
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
         
     except Exception as e:
         return jsonify({'error': f'Failed to analyze structure: {str(e)}'}), 500
 
+@app.route('/api/analyze-structure', methods=['GET'])
+@validate_args(StructureLookupParams)
+def get_structure_analysis(params: StructureLookupParams):
+    """
+    Get the cached structure analysis of a URL, without crawling or calling Gemini.
+    
+    Same body and ETag as POST /api/analyze-structure. A request whose
+    If-None-Match matches the ETag gets a bodiless 304; a URL with no cached
+    analysis gets 404 (POST to run one).
+    """
+    try:
+        result = structureAnalyzer.get_cached_structure_analysis(params.url)
+        if result is None:
+            return jsonify({'error': 'No cached structure analysis for this URL'}), 404
+        
+        payload, etag, _ = _structure_response_json(params.url, result)
+        response = Response(payload, mimetype='application/json')
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get structure analysis: {str(e)}'}), 500
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
     return jsonify({'error': 'Endpoint not found'}), 404
 
+@app.errorhandler(413)
+def request_too_large(error):
+    """Handle request bodies over MAX_REQUEST_BODY_BYTES."""
+    return jsonify({'error': f'Request body too large (limit {MAX_REQUEST_BODY_BYTES} bytes)'}), 413
+
+@app.errorhandler(HTTPException)
+def http_error(error):
+    """Answer every other HTTP error (e.g. 405 Method Not Allowed) with JSON instead of Werkzeug's HTML page."""
+    response = jsonify({'error': error.description})
+    response.status_code = error.code
+    for name, value in error.get_headers():
+        if name.lower() != 'content-type':
+            response.headers[name] = value  # e.g. Allow on 405
+    return response
+
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
@@ -323,10 +795,18 @@ if __name__ == '__main__':
     print("Available endpoints:")
     print("  POST /api/start-analysis - Start analysis for a URL")
     print("  GET  /api/status - Get current analysis status")
+    print("  GET  /api/status/stream - Stream analysis status (Server-Sent Events; alias /api/events)")
+    print("  GET  /api/jobs/<job_id> - Get a recorded analysis job")
     print("  GET  /api/aggregate-results - Get aggregate results")
     print("  POST /api/query-details - Get details for specific query")
+    print("  POST /api/query-details-batch - Get details for several queries")
+    print("  POST /api/batch - Run several read-only calls in one request")
     print("  POST /api/reset - Reset analyzer")
+    print("  POST /api/analyze-structure - Analyze website structure")
+    print("  GET  /api/analyze-structure?url=... - Get a cached structure analysis (supports If-None-Match)")
     print("  GET  /api/health - Health check")
     print("\nAPI running on http://localhost:8000")
+    print("(development server; use `gunicorn -c gunicorn_conf.py asgi:app` in production)")
     
-    app.run(host='0.0.0.0', port=8000, debug=True)
+    # Loopback only: with FLASK_DEBUG=1 this serves Werkzeug's interactive debugger
+    app.run(host='127.0.0.1', port=8000, debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True)
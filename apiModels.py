@@ -0,0 +1,119 @@
+"""
+Request and response models for the Analysis API.
+
+Each POST endpoint validates its JSON body against one of these models (via
+api.validate_body), and query strings are validated the same way (via
+api.validate_args), so type/range checks run in pydantic's compiled core
+instead of hand-written per-route checks.
+
+Fixed-shape responses are frozen dataclasses, which orjson serializes
+natively without building an intermediate dict.
+"""
+
+from dataclasses import dataclass
+from typing import Annotated, Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, StringConstraints, ValidationError
+
+MAX_QUERIES = 50  # upper bound for numOfQueries
+MAX_BATCH_QUERIES = 50  # upper bound for /api/query-details-batch
+MAX_BATCH_REQUESTS = 20  # upper bound for /api/batch
+
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+
+class StartAnalysisRequest(BaseModel):
+    """Body of POST /api/start-analysis."""
+    url: NonEmptyStr
+    numOfQueries: Optional[Annotated[int, Field(strict=True, ge=1, le=MAX_QUERIES)]] = None  # None keeps the current setting
+
+
+class StartAnalysisParams(BaseModel):
+    """Query string of POST /api/start-analysis."""
+    force_refresh: bool = False  # run again even if a completed analysis could be reused
+
+
+class QueryDetailsRequest(BaseModel):
+    """Body of POST /api/query-details."""
+    query: str
+
+
+class QueryDetailsBatchRequest(BaseModel):
+    """Body of POST /api/query-details-batch."""
+    queries: Annotated[List[str], Field(max_length=MAX_BATCH_QUERIES)]
+
+
+class AnalyzeStructureRequest(BaseModel):
+    """Body of POST /api/analyze-structure."""
+    url: NonEmptyStr
+
+
+class JobParams(BaseModel):
+    """Query string of the endpoints that report on one analysis (status, query details, reset)."""
+    job_id: Optional[NonEmptyStr] = None  # job returned by /api/start-analysis; defaults to the current analysis
+
+
+class AggregateResultsParams(JobParams):
+    """Query string of GET /api/aggregate-results."""
+    url: Optional[NonEmptyStr] = None  # read a completed analysis of this URL instead of the current one
+
+
+class AnalyzeStructureParams(BaseModel):
+    """Query string of POST /api/analyze-structure."""
+    force_refresh: bool = False  # accepts 1/0, true/false, yes/no, on/off
+
+
+class StructureLookupParams(BaseModel):
+    """Query string of GET /api/analyze-structure."""
+    url: NonEmptyStr
+
+
+class SubRequest(BaseModel):
+    """One entry of an /api/batch body; sent as POST when it has a body, else GET."""
+    path: str
+    params: Optional[Dict[str, str]] = None  # query string, e.g. {"job_id": "..."}
+    body: Optional[Dict[str, Any]] = None
+
+
+class BatchRequest(BaseModel):
+    """Body of POST /api/batch."""
+    requests: Annotated[List[SubRequest], Field(min_length=1, max_length=MAX_BATCH_REQUESTS)]
+
+
+@dataclass(frozen=True)
+class StatusResponse:
+    """Body of GET /api/status (and of the 'status' events on /api/status/stream)."""
+    status: str  # idle, analyzing, complete, error
+    url: str
+    num_queries: int
+    queries_done: int  # queries analyzed so far, out of num_queries
+    queries_to_run: int
+    job_id: Optional[str]
+
+
+@dataclass(frozen=True)
+class StartAnalysisResponse:
+    """Body of a successful POST /api/start-analysis."""
+    status: str  # 'started', or 'complete' when a finished analysis was reused
+    message: str
+    url: str
+    numOfQueries: int
+    job_id: Optional[str]
+    cached: bool
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """
+    Turn a pydantic ValidationError into a short message for the API's {'error': ...} body.
+
+    Args:
+        error: The validation error raised by model_validate
+
+    Returns:
+        str: One 'field: problem' entry per invalid field, separated by '; '
+    """
+    parts = []
+    for item in error.errors():
+        field = '.'.join(str(loc) for loc in item['loc'])
+        parts.append(f"{field}: {item['msg']}" if field else item['msg'])
+    return '; '.join(parts)
@@ -0,0 +1,29 @@
+"""
+ASGI entry point for the Analysis API
+========================================
+
+Serves the Flask app from api.py under Uvicorn:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8000
+
+Keep a single worker: the analyzer state lives in the API process, so
+separate workers would not see each other's analyses.
+
+The routes stay synchronous Flask views. The slow I/O they trigger (crawls,
+Gemini calls) already runs as coroutines on the shared loop in eventLoop.py,
+so a request thread only waits on a future; it does not own an event loop.
+
+Each request runs on a pool of WSGI_THREADS threads, so a long structure
+analysis or an open /api/status/stream connection does not hold up other
+requests. Every open status stream occupies one thread while it lasts.
+"""
+
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from api import app as flask_app
+
+WSGI_THREADS = int(os.environ.get('WSGI_THREADS', 32))
+
+app = WSGIMiddleware(flask_app, workers=WSGI_THREADS)
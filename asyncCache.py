@@ -0,0 +1,136 @@
+"""
+Small in-process TTL cache for expensive coroutines (crawls, structure analyses).
+
+Entries expire after a TTL and the oldest are evicted past a size limit.
+Concurrent callers asking for the same key share a single computation.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+
+def url_cache_key(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings share one cache entry.
+
+    Args:
+        url: The URL as given by the caller.
+
+    Returns:
+        str: The URL with scheme/host lowercased, fragment and trailing slash removed.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+class AsyncTTLCache:
+    """
+    TTL + LRU cache whose misses are filled by awaiting a coroutine factory.
+
+    Cached values are shared between callers, so they must be treated as read-only.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long an entry stays valid.
+            max_entries: Maximum number of entries kept; the least recently used are dropped first.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # key -> (stored_at, value)
+        self._entries_lock = threading.Lock()
+        # key -> [lock held while computing it, callers using the lock]; the entry is
+        # dropped when the last caller leaves, not when the lock is released, since
+        # waiters queued on the lock have not resumed yet at that point
+        self._inflight: Dict[Hashable, list] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a fresh entry.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached value, or None on a miss or an expired entry.
+        """
+        with self._entries_lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entries past max_entries.
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+        """
+        with self._entries_lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """
+        Drop an entry so the next lookup recomputes it.
+
+        Args:
+            key: Cache key.
+        """
+        with self._entries_lock:
+            self._entries.pop(key, None)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: value is not None
+    ) -> Any:
+        """
+        Return the cached value for key, computing it at most once at a time.
+
+        Args:
+            key: Cache key.
+            compute: Zero-argument coroutine function producing the value on a miss.
+            should_cache: Decides whether a computed value is stored (failures usually are not).
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.setdefault(key, [asyncio.Lock(), 0])
+        inflight[1] += 1
+        try:
+            async with inflight[0]:
+                # Another caller may have filled the entry while we waited
+                cached = self.get(key)
+                if cached is not None:
+                    return cached
+
+                value = await compute()
+                if should_cache(value):
+                    self.set(key, value)
+                return value
+        finally:
+            inflight[1] -= 1
+            if inflight[1] == 0 and self._inflight.get(key) is inflight:
+                del self._inflight[key]
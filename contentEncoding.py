@@ -0,0 +1,58 @@
+"""
+Pre-compression of payloads that are served many times unchanged.
+
+Flask-Compress compresses each response as it goes out. For bytes that are
+built once and then polled repeatedly (the aggregate results), compressing them
+once up front at a high level and picking a variant per request is cheaper.
+"""
+
+import gzip
+from typing import Callable, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional: without it clients get Brotli or gzip
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ZSTD_LEVEL = 19
+BROTLI_QUALITY = 11
+GZIP_LEVEL = 9
+
+# Content-Encoding name -> compressor, in order of preference
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {}
+if zstandard is not None:
+    ENCODERS['zstd'] = lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+if brotli is not None:
+    ENCODERS['br'] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+ENCODERS['gzip'] = lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encode_all(data: bytes) -> Dict[str, bytes]:
+    """
+    Compress data with every available encoder.
+
+    Args:
+        data: The payload to compress.
+
+    Returns:
+        Dict[str, bytes]: Content-Encoding name -> compressed bytes.
+    """
+    return {name: encoder(data) for name, encoder in ENCODERS.items()}
+
+
+def negotiate(accept_encodings) -> Optional[str]:
+    """
+    Pick the preferred encoding the client accepts.
+
+    Args:
+        accept_encodings: The request's parsed Accept-Encoding header (werkzeug Accept).
+
+    Returns:
+        Optional[str]: An ENCODERS key, or None to send the payload uncompressed.
+    """
+    return accept_encodings.best_match(list(ENCODERS))
@@ -3,13 +3,20 @@
 Extracts content exactly as modern LLMs would see it for GEO analysis
 """
 
-from .core_crawler import GEOCrawler
-from .html_parser import HTMLParser
-from .data_normalizer import DataNormalizer
-from .output_handler import OutputHandler
-from .llm_txt_extractor import LLMTxtExtractor
+import importlib
+
 from .utils import create_output_filename, ensure_output_directory
 
+# Classes imported on first access (PEP 562), so importing the package or a
+# single submodule does not pull in crawl4ai, aiohttp and BeautifulSoup
+_LAZY = {
+    "GEOCrawler": ".core_crawler",
+    "HTMLParser": ".html_parser",
+    "DataNormalizer": ".data_normalizer",
+    "OutputHandler": ".output_handler",
+    "LLMTxtExtractor": ".llm_txt_extractor",
+}
+
 __version__ = "1.0.0"
 __all__ = [
     "GEOCrawler",
@@ -19,3 +26,11 @@ __all__ = [
     "create_output_filename",
     "ensure_output_directory"
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
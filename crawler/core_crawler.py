@@ -7,6 +7,7 @@ import time
 import aiohttp
 from datetime import datetime, timezone
 from crawl4ai import AsyncWebCrawler
+from .http_session import get_http_session
 
 
 class GEOCrawler:
@@ -48,23 +49,23 @@ class GEOCrawler:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.head(url, allow_redirects=True, timeout=10) as response:
-                    http_info["status_code"] = response.status
-                    http_info["final_url"] = str(response.url)
-                    http_info["response_headers"] = dict(response.headers)
-                    http_info["content_language"] = response.headers.get('Content-Language')
-                    http_info["last_modified"] = response.headers.get('Last-Modified')
-                    http_info["content_type"] = response.headers.get('Content-Type')
-                    
-                    # Track redirects
-                    if response.history:
-                        for redirect in response.history:
-                            http_info["redirects"].append({
-                                "from": str(redirect.url),
-                                "to": str(redirect.headers.get('Location', '')),
-                                "status": redirect.status
-                            })
+            session = get_http_session()
+            async with session.head(url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                http_info["status_code"] = response.status
+                http_info["final_url"] = str(response.url)
+                http_info["response_headers"] = dict(response.headers)
+                http_info["content_language"] = response.headers.get('Content-Language')
+                http_info["last_modified"] = response.headers.get('Last-Modified')
+                http_info["content_type"] = response.headers.get('Content-Type')
+                
+                # Track redirects
+                if response.history:
+                    for redirect in response.history:
+                        http_info["redirects"].append({
+                            "from": str(redirect.url),
+                            "to": str(redirect.headers.get('Location', '')),
+                            "status": redirect.status
+                        })
         except Exception as e:
             print(f"  HTTP metadata warning: {e}")
         
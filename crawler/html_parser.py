@@ -36,6 +36,8 @@ class HTMLParser:
             for script in json_ld_scripts:
                 try:
                     if script.string:
+                        # Third-party markup: stdlib json accepts NaN/Infinity and
+                        # integers wider than 64 bits, which orjson rejects
                         json_data = json.loads(script.string.strip())
                         structured_data["schema_org"].append({
                             "type": "JSON-LD",
@@ -0,0 +1,28 @@
+"""
+HTTP Session Module - Shares one aiohttp session per event loop
+Single Responsibility: Keep HTTP connections, DNS lookups and TLS sessions alive across crawls
+"""
+
+import asyncio
+import weakref
+
+import aiohttp
+
+# event loop -> its session; aiohttp sessions are bound to the loop that created them
+_sessions = weakref.WeakKeyDictionary()
+
+
+def get_http_session():
+    """
+    Get the aiohttp session of the running event loop, creating it on first use.
+
+    Callers pass their own per-request timeouts and must not close the session.
+    On the API's long-lived loop (eventLoop.py) the session lasts for the whole
+    process, so repeat crawls of an origin reuse its keep-alive connections.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession()
+        _sessions[loop] = session
+    return session
@@ -6,8 +6,11 @@ Single Responsibility: Detect and extract llm.txt files from websites
 import aiohttp
 import asyncio
 from urllib.parse import urljoin, urlparse
+import json
 from typing import Dict, Optional, List
 
+from .http_session import get_http_session
+
 
 class LLMTxtExtractor:
     """Handles detection and extraction of llm.txt files for GEO optimization"""
@@ -57,7 +60,8 @@ class LLMTxtExtractor:
         
         # Method 1: Extract from HTML content (how LLMs actually see it)
         if html_content:
-            embedded_content = self._extract_from_html(html_content)
+            # HTML parsing is CPU-bound; keep it off the event loop
+            embedded_content = await asyncio.to_thread(self._extract_from_html, html_content)
             if embedded_content["found"]:
                 llm_txt_data.update({
                     "llm_txt_found": True,
@@ -126,11 +130,13 @@ class LLMTxtExtractor:
                 if subdomain_url not in domains_to_check:
                     domains_to_check.append(subdomain_url)
         
-        # Try each domain + path combination
+        # Try each domain + path combination on the shared session, so the probes
+        # on a host (and later crawls of it) share its keep-alive connection
+        session = get_http_session()
         for domain in domains_to_check:
             for path in self.common_llm_txt_paths:
                 llm_txt_url = urljoin(domain, path)
-                attempt_result = await self._fetch_llm_txt(llm_txt_url)
+                attempt_result = await self._fetch_llm_txt(session, llm_txt_url)
                 
                 result["attempts"].append({
                     "url": llm_txt_url,
@@ -219,14 +225,15 @@ class LLMTxtExtractor:
             for script in scripts:
                 try:
                     if script.string:
-                        import json
-                        data = json.loads(script.string.strip())
-                        # Check if JSON contains AI/LLM related fields
-                        json_str = json.dumps(data).lower()
+                        script_text = script.string.strip()
+                        json.loads(script_text)  # only well-formed JSON-LD counts
+                        # Check if JSON contains AI/LLM related fields (searching the
+                        # source text; re-serializing the parsed data is not needed)
+                        json_str = script_text.lower()
                         if any(keyword in json_str for keyword in ['llm', 'ai', 'assistant', 'model', 'gpt']):
                             # Validate the content before accepting it as LLM.txt
-                            if self._validate_llm_txt_content(script.string.strip()):
-                                extracted_content.append(script.string.strip())
+                            if self._validate_llm_txt_content(script_text):
+                                extracted_content.append(script_text)
                                 sources.append("json_ld")
                 except:
                     continue
@@ -276,39 +283,38 @@ class LLMTxtExtractor:
         
         return result
     
-    async def _fetch_llm_txt(self, url: str) -> Dict:
-        """Fetch llm.txt content from a specific URL"""
+    async def _fetch_llm_txt(self, session: aiohttp.ClientSession, url: str) -> Dict:
+        """Fetch llm.txt content from a specific URL using the caller's session"""
         try:
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                async with session.get(url, allow_redirects=True) as response:
-                    if response.status == 200:
-                        content_type = response.headers.get('content-type', '').lower()
-                        
-                        # Get content first to validate
-                        content = await response.text(encoding='utf-8')
-                        
-                        # Check if it's likely a text file based on content-type OR if it passes LLM.txt validation
-                        # Many servers misconfigure MIME types for .txt files, so we rely more on content validation
-                        is_text_type = ('text' in content_type or 
-                                      content_type == 'application/octet-stream' or
-                                      'xml' in content_type or  # Some servers return application/rss+xml for .txt
-                                      'html' in content_type)   # Some servers return text/html for .txt
-                        
-                        # If content validates as LLM.txt, accept it regardless of content-type
-                        if self._validate_llm_txt_content(content):
-                            return {
-                                "success": True,
-                                "content": content,
-                                "content_type": content_type,
-                                "status_code": response.status
-                            }
+            async with session.get(url, allow_redirects=True, timeout=self.timeout) as response:
+                if response.status == 200:
+                    content_type = response.headers.get('content-type', '').lower()
                     
-                    return {
-                        "success": False,
-                        "status_code": response.status,
-                        "error": f"HTTP {response.status}"
-                    }
-        
+                    # Get content first to validate
+                    content = await response.text(encoding='utf-8')
+                    
+                    # Check if it's likely a text file based on content-type OR if it passes LLM.txt validation
+                    # Many servers misconfigure MIME types for .txt files, so we rely more on content validation
+                    is_text_type = ('text' in content_type or 
+                                  content_type == 'application/octet-stream' or
+                                  'xml' in content_type or  # Some servers return application/rss+xml for .txt
+                                  'html' in content_type)   # Some servers return text/html for .txt
+                    
+                    # If content validates as LLM.txt, accept it regardless of content-type
+                    if self._validate_llm_txt_content(content):
+                        return {
+                            "success": True,
+                            "content": content,
+                            "content_type": content_type,
+                            "status_code": response.status
+                        }
+                
+                return {
+                    "success": False,
+                    "status_code": response.status,
+                    "error": f"HTTP {response.status}"
+                }
+    
         except asyncio.TimeoutError:
             return {"success": False, "error": "Timeout"}
         except aiohttp.ClientError as e:
@@ -12,6 +12,7 @@ Modular Architecture:
 """
 
 import asyncio
+import os
 import sys
 from urllib.parse import urlparse
 
@@ -20,6 +21,15 @@ from .html_parser import HTMLParser
 from .data_normalizer import DataNormalizer
 from .output_handler import OutputHandler
 from .llm_txt_extractor import LLMTxtExtractor
+from asyncCache import AsyncTTLCache, url_cache_key
+
+CRAWL_CACHE_TTL_SECONDS = 10 * 60
+CRAWL_CACHE_MAX_ENTRIES = 64
+CRAWL_CONCURRENCY = int(os.environ.get('CRAWL_CONCURRENCY', 2))  # headless-browser crawls running at once
+
+# normalized URL -> successful crawl result, shared by query generation and structure analysis
+_crawl_cache = AsyncTTLCache(CRAWL_CACHE_TTL_SECONDS, CRAWL_CACHE_MAX_ENTRIES)
+_crawl_semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
 
 
 class GEOCrawlerOrchestrator:
@@ -61,20 +71,10 @@ class GEOCrawlerOrchestrator:
                 http_info["status_code"] = http_info.get("status_code") or 200
             
             # Step 5: Parse HTML content
-            print("  Parsing structured data...")
-            structured_data = self.parser.parse_structured_data(content_data["rendered_html"])
-            
-            print(" Extracting meta data...")
-            meta_data = self.parser.extract_meta_data(content_data["rendered_html"])
-            
-            print(" Extracting language info...")
-            language_info = self.parser.extract_language_info(content_data["rendered_html"], http_info)
-            
-            print(" Extracting links and images...")
-            links, images = self.parser.extract_links_and_images(content_data["rendered_html"], http_info["final_url"])
-            
-            print(" Analyzing DOM changes...")
-            dom_diff = self.parser.calculate_dom_diff(content_data["original_html"], content_data["rendered_html"])
+            # BeautifulSoup parsing is CPU-bound; run it in a worker thread so other crawls keep going
+            structured_data, meta_data, language_info, links, images, dom_diff = await asyncio.to_thread(
+                self._parse_page, content_data, http_info
+            )
             
             # Step 6: Extract llm.txt for GEO optimization
             print(" Searching for llm.txt content...")
@@ -123,7 +123,7 @@ class GEOCrawlerOrchestrator:
             #     links, images, language_info, meta_data, content_data, dom_diff
             # )
             
-            save_info = self.output_handler.save_output(output_data, url)
+            save_info = await asyncio.to_thread(self.output_handler.save_output, output_data, url)
             self.output_handler.print_save_summary(save_info)
             
             return output_data
@@ -131,6 +131,25 @@ class GEOCrawlerOrchestrator:
         except Exception as e:
             print(f" Crawling failed: {e}")
             return None
+    
+    def _parse_page(self, content_data, http_info):
+        """Run every HTML parsing step on the fetched page (blocking)"""
+        print("  Parsing structured data...")
+        structured_data = self.parser.parse_structured_data(content_data["rendered_html"])
+        
+        print(" Extracting meta data...")
+        meta_data = self.parser.extract_meta_data(content_data["rendered_html"])
+        
+        print(" Extracting language info...")
+        language_info = self.parser.extract_language_info(content_data["rendered_html"], http_info)
+        
+        print(" Extracting links and images...")
+        links, images = self.parser.extract_links_and_images(content_data["rendered_html"], http_info["final_url"])
+        
+        print(" Analyzing DOM changes...")
+        dom_diff = self.parser.calculate_dom_diff(content_data["original_html"], content_data["rendered_html"])
+        
+        return structured_data, meta_data, language_info, links, images, dom_diff
 
 
 
@@ -167,6 +186,24 @@ async def crawl_url(url: str):
 
     return result
 
+async def crawl_url_cached(url: str, force_refresh: bool = False):
+    """
+    Crawl a URL, reusing a result from the last CRAWL_CACHE_TTL_SECONDS if there is one.
+
+    Concurrent calls for the same URL share one crawl, and at most
+    CRAWL_CONCURRENCY crawls run at once. Failed crawls are not cached.
+    The returned dict is shared between callers and must not be modified.
+    Pass force_refresh=True to drop the cached crawl and fetch the page again.
+    """
+    if force_refresh:
+        _crawl_cache.invalidate(url_cache_key(url))
+    
+    async def crawl_limited():
+        async with _crawl_semaphore:
+            return await crawl_url(url)
+    
+    return await _crawl_cache.get_or_compute(url_cache_key(url), crawl_limited)
+
 async def main():
     """Main entry point"""
     
@@ -5,6 +5,9 @@ Single Responsibility: Save crawler results to files and format output
 
 import json
 import os
+
+import orjson
+
 from .utils import create_output_filename, ensure_output_directory
 
 
@@ -48,8 +51,14 @@ class OutputHandler:
         filename = create_output_filename(url)
         filepath = os.path.join(output_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        # The crawl holds the full raw and rendered HTML; orjson writes it as UTF-8 bytes in one pass
+        try:
+            payload = orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # JSON-LD may carry integers wider than 64 bits, which only stdlib json writes
+            payload = json.dumps(output_data, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(filepath, 'wb') as f:
+            f.write(payload)
         
         file_size = os.path.getsize(filepath) / 1024  # KB
         
@@ -20,14 +20,40 @@ Output Format:
 ]
 """
 
-import json
+import asyncio
+import os
 import re
-from collections import defaultdict
-from typing import Dict, List, Any
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Union
 from urllib.parse import urlparse
 from geminiClient.gemini import GeminiGroundedClient
+from reportStorage import REPORTS_DIR, save_json
 
 
+DEFAULT_CONCURRENCY = int(os.environ.get('GEMINI_CONCURRENCY', 8))  # Maximum number of Gemini requests in flight at once
+
+# Used by DomainAnalyzer.normalize_domain, which runs once per grounding link;
+# built once here instead of on every call
+_WWW_PREFIX = re.compile(r'^www\.')
+
+# Country-code TLDs and the second-level labels registered under them (e.g. "co.uk")
+COUNTRY_CODES = frozenset({
+    'uk', 'au', 'ca', 'in', 'np', 'nz', 'za', 'br', 'mx', 'ar', 'cl', 'pe', 'co',
+    'jp', 'kr', 'cn', 'hk', 'sg', 'my', 'th', 'id', 'ph', 'vn', 'tw',
+    'de', 'fr', 'it', 'es', 'nl', 'be', 'at', 'ch', 'se', 'no', 'dk', 'fi',
+    'pl', 'cz', 'hu', 'sk', 'si', 'hr', 'rs', 'bg', 'ro', 'gr', 'cy', 'mt',
+    'ie', 'pt', 'lu', 'li', 'is', 'lv', 'lt', 'ee', 'ua', 'ru', 'by', 'md',
+    'eg', 'il', 'tr', 'sa', 'ae', 'qa', 'kw', 'bh', 'om', 'jo', 'lb', 'ir',
+    'ke', 'ng', 'gh', 'ma', 'tn', 'dz', 'ly', 'sd', 'et', 'tz', 'ug', 'rw',
+    'bd', 'pk', 'lk', 'mm', 'la', 'kh', 'bn', 'mv'
+})
+SECOND_LEVEL_DOMAINS = frozenset({
+    'co', 'com', 'org', 'net', 'edu', 'gov', 'mil', 'ac', 'sch', 'uni',
+    'info', 'biz', 'name', 'pro', 'museum', 'travel', 'mobi', 'tel',
+    'jobs', 'cat', 'asia', 'post', 'geo', 'int'
+})
 
 
 
@@ -66,7 +92,7 @@ class DomainAnalyzer:
             return ""
         
         # Remove www prefix
-        domain = re.sub(r'^www\.', '', domain.lower())
+        domain = _WWW_PREFIX.sub('', domain.lower())
         
         # Handle common subdomain patterns
         # Keep only the main domain for well-known sites
@@ -77,23 +103,6 @@ class DomainAnalyzer:
             # Keep the last two parts (wikipedia.org, yahoo.com)
             # But handle special cases like "co.uk", "com.au"
 
-            # Define sets for efficient lookup
-            COUNTRY_CODES = {
-                'uk', 'au', 'ca', 'in', 'np', 'nz', 'za', 'br', 'mx', 'ar', 'cl', 'pe', 'co',
-                'jp', 'kr', 'cn', 'hk', 'sg', 'my', 'th', 'id', 'ph', 'vn', 'tw',
-                'de', 'fr', 'it', 'es', 'nl', 'be', 'at', 'ch', 'se', 'no', 'dk', 'fi',
-                'pl', 'cz', 'hu', 'sk', 'si', 'hr', 'rs', 'bg', 'ro', 'gr', 'cy', 'mt',
-                'ie', 'pt', 'lu', 'li', 'is', 'lv', 'lt', 'ee', 'ua', 'ru', 'by', 'md',
-                'eg', 'il', 'tr', 'sa', 'ae', 'qa', 'kw', 'bh', 'om', 'jo', 'lb', 'ir',
-                'ke', 'ng', 'gh', 'ma', 'tn', 'dz', 'ly', 'sd', 'et', 'tz', 'ug', 'rw',
-                'bd', 'pk', 'lk', 'mm', 'la', 'kh', 'bn', 'mv'
-            }
-            SECOND_LEVEL_DOMAINS = {
-                'co', 'com', 'org', 'net', 'edu', 'gov', 'mil', 'ac', 'sch', 'uni',
-                'info', 'biz', 'name', 'pro', 'museum', 'travel', 'mobi', 'tel',
-                'jobs', 'cat', 'asia', 'post', 'geo', 'int'
-            }
-
             if domain_parts[-1] in COUNTRY_CODES and domain_parts[-2] in SECOND_LEVEL_DOMAINS:
                 # Keep last 3 parts for domains like "bbc.co.uk"
                 return '.'.join(domain_parts[-3:])
@@ -111,7 +120,7 @@ class DomainAnalyzer:
             response_data: Response from GeminiGroundedClient.process_query()
             
         Returns:
-            List of normalized domain names
+            List of normalized domain names, interned so repeated domains share one string
         """
         domains = []
         
@@ -125,7 +134,7 @@ class DomainAnalyzer:
                 if title_domain:
                     normalized = self.normalize_domain(title_domain)
                     if normalized:
-                        domains.append(normalized)
+                        domains.append(sys.intern(normalized))
                         continue
                 
                 # Fallback to extracting from actual_url
@@ -135,7 +144,7 @@ class DomainAnalyzer:
                         parsed = urlparse(actual_url)
                         normalized = self.normalize_domain(parsed.netloc)
                         if normalized:
-                            domains.append(normalized)
+                            domains.append(sys.intern(normalized))
                     except Exception:
                         pass
         
@@ -145,80 +154,121 @@ class DomainAnalyzer:
         """
         Count domain occurrences and sort by frequency.
         
+        Each domain appears exactly once in the returned list, so consumers can
+        treat the 'links' of a result as a set of unique domains.
+        
         Args:
             domains: List of domain names
             
         Returns:
             Sorted list of {"domain": str, "count": int} dictionaries
         """
-        domain_counts = defaultdict(int)
-        
-        for domain in domains:
-            domain_counts[domain] += 1
-        
         # Sort by count (descending)
-        sorted_domains = sorted(
-            domain_counts.items(), 
-            key=lambda x: (-x[1])
-        )
+        sorted_domains = Counter(domains).most_common()
         
         return [{"domain": domain, "count": count} for domain, count in sorted_domains]
     
-    def analyze_queries(self, queries: List[Dict[str, Any]], resolve_urls: bool = True) -> List[Dict[str, Any]]:
+    def analyze_query(self, query_obj: Dict[str, Any], resolve_urls: bool = True, position: str = "", bypass_cache: bool = False) -> Dict[str, Any]:
         """
-        Analyze multiple queries and generate domain frequency statistics.
+        Analyze a single query and generate its domain frequency statistics.
 
         Args:
-            queries: List of query dictionaries with 'query' and 'type' fields
+            query_obj: Query dictionary with 'query' and 'type' fields (or a plain query string)
             resolve_urls: Whether to resolve actual URLs
+            position: Progress label such as "2/8" used in log output
+            bypass_cache: Whether to ignore cached Gemini responses
             
         Returns:
-            List of analysis results in the specified format
+            Analysis result in the specified format. 'query', 'query_type', 'links' and
+            'complete_result' are always present; on failure 'links' is empty and
+            'complete_result' is None.
         """
-        results = []
+        query_text = query_obj.get('query', '') if isinstance(query_obj, dict) else str(query_obj)
+        query_type = query_obj.get('type', 'Generic') if isinstance(query_obj, dict) else 'Generic'
         
-        print(f"Analyzing {len(queries)} structured queries...")
+        print(f"\nProcessing query {position} [{query_type}]: {query_text[:50]}...")
         
-        for i, query_obj in enumerate(queries, 1):
+        try:
+            response_data = self.client.process_query(query_text, resolve_urls=resolve_urls, bypass_cache=bypass_cache)
             
-            query_text = query_obj.get('query', '') if isinstance(query_obj, dict) else str(query_obj)
-            query_type = query_obj.get('type', 'Generic') if isinstance(query_obj, dict) else 'Generic'
+            domains = self.extract_domains_from_response(response_data)
             
-            print(f"\nProcessing query {i}/{len(queries)} [{query_type}]: {query_text[:50]}...")
+            domain_stats = self.count_domains(domains)
             
-            try:
-                response_data = self.client.process_query(query_text, resolve_urls=resolve_urls)
-                
-                domains = self.extract_domains_from_response(response_data)
-                
-                domain_stats = self.count_domains(domains)
-                
-                results.append({
-                    "query": query_text,
-                    "query_type": query_type,  # Store the query type for future use
-                    "links": domain_stats,
-                    "complete_result": response_data
-                })
-                
-                print(f"Found {len(domains)} total domain references, {len(domain_stats)} unique domains")
-                
-            except Exception as e:
-                print(f"Error processing query '{query_text}': {e}")
-                results.append({
-                    "query": query_text,
-                    "query_type": query_type,
-                    "links": [],
-                    "complete_result": None
-                })
-        
-        return results
+            print(f"Found {len(domains)} total domain references, {len(domain_stats)} unique domains")
+            
+            return {
+                "query": query_text,
+                "query_type": query_type,  # Store the query type for future use
+                "links": domain_stats,
+                "complete_result": response_data
+            }
+            
+        except Exception as e:
+            print(f"Error processing query '{query_text}': {e}")
+            return {
+                "query": query_text,
+                "query_type": query_type,
+                "links": [],
+                "complete_result": None
+            }
+    
+    def analyze_queries(self, queries: List[Dict[str, Any]], resolve_urls: bool = True, bypass_cache: bool = False) -> List[Dict[str, Any]]:
+        """
+        Analyze multiple queries one after another and generate domain frequency statistics.
+
+        Args:
+            queries: List of query dictionaries with 'query' and 'type' fields
+            resolve_urls: Whether to resolve actual URLs
+            bypass_cache: Whether to ignore cached Gemini responses
+            
+        Returns:
+            List of analysis results in the specified format
+        """
+        print(f"Analyzing {len(queries)} structured queries...")
+        
+        return [
+            self.analyze_query(query_obj, resolve_urls, f"{i}/{len(queries)}", bypass_cache)
+            for i, query_obj in enumerate(queries, 1)
+        ]
+    
+    async def analyze_queries_async(self, queries: List[Dict[str, Any]], resolve_urls: bool = True,
+                                    concurrency: int = DEFAULT_CONCURRENCY, bypass_cache: bool = False,
+                                    on_result: Optional[Callable[[], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze multiple queries concurrently and generate domain frequency statistics.
+        
+        The Gemini client is blocking, so each query runs in a worker thread; the
+        semaphore caps how many requests are in flight at once.
+
+        Args:
+            queries: List of query dictionaries with 'query' and 'type' fields
+            resolve_urls: Whether to resolve actual URLs
+            concurrency: Maximum number of queries processed at the same time
+            bypass_cache: Whether to ignore cached Gemini responses
+            on_result: Called on the event loop each time a query finishes (in completion order)
+            
+        Returns:
+            List of analysis results in the specified format, in the same order as queries
+        """
+        print(f"Analyzing {len(queries)} structured queries (up to {concurrency} at a time)...")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def analyze_one(i: int, query_obj: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                result = await asyncio.to_thread(self.analyze_query, query_obj, resolve_urls, f"{i}/{len(queries)}", bypass_cache)
+            if on_result is not None:
+                on_result()
+            return result
+        
+        return await asyncio.gather(*(analyze_one(i, query_obj) for i, query_obj in enumerate(queries, 1)))
     
-    def save_analysis(self, results: List[Dict[str, Any]], filename: str = r"analysisReports\domain_analysis_prompted.json"):
+    def save_analysis(self, results: List[Dict[str, Any]], filename: Union[str, Path] = REPORTS_DIR / "domain_analysis_prompted.json"):
         """
-        Save the analysis results to a JSON file.
+        Save the analysis results to a JSON file (atomically, see reportStorage.save_json).
         """
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        save_json(filename, results)
         
         print(f"\nAnalysis saved to {filename}")
     
@@ -0,0 +1,89 @@
+"""
+Process-wide asyncio event loop running in a background thread.
+
+Flask handlers are synchronous, so instead of creating and tearing down a new
+loop with asyncio.run() on every request, coroutines are submitted to this
+long-lived loop with asyncio.run_coroutine_threadsafe(). Blocking work the
+coroutines hand off with asyncio.to_thread() runs on one named, fixed-size
+thread pool (BLOCKING_THREADS).
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Coroutine, Optional
+
+try:
+    import uvloop  # faster libuv-based loop; not available on Windows
+except ImportError:
+    uvloop = None
+
+# Worker threads for asyncio.to_thread(). asyncio's default is min(32, CPUs + 4),
+# which on a small machine is fewer than the Gemini calls a couple of running
+# analyses keep in flight (GEMINI_CONCURRENCY each).
+BLOCKING_THREADS = int(os.environ.get('BLOCKING_THREADS', 32))
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the shared background event loop, starting it on first use.
+
+    Uses uvloop when it is installed. The loop's default executor is a
+    ThreadPoolExecutor of BLOCKING_THREADS workers named 'loop-worker'.
+
+    Returns:
+        asyncio.AbstractEventLoop: A running loop owned by a daemon thread
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+                max_workers=BLOCKING_THREADS, thread_name_prefix='loop-worker'
+            ))
+            print(f"Background event loop: {type(loop).__module__}.{type(loop).__name__}")
+            threading.Thread(target=loop.run_forever, name='event-loop', daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def submit(coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+    """
+    Schedule a coroutine on the shared loop without waiting for it.
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        concurrent.futures.Future: Resolves to the coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run_coroutine(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared loop and block the calling thread until it finishes.
+
+    Must not be called from the loop's own thread. On timeout the coroutine is
+    cancelled, so it stops holding crawl slots and connections on the shared loop.
+
+    Args:
+        coro: The coroutine to run
+        timeout: Seconds to wait before giving up (None waits forever)
+
+    Returns:
+        Any: The coroutine's result
+
+    Raises:
+        concurrent.futures.TimeoutError: If the coroutine did not finish within timeout
+    """
+    future = submit(coro)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
@@ -6,6 +6,8 @@ class FrontendAPP {
         this.aggregateChart = null;
         this.queryChart = null;
         this.pollingInterval = null;
+        this.statusStream = null;
+        this.jobId = null;
         
         this.init();
     }
@@ -62,6 +64,11 @@ class FrontendAPP {
     }
 
     // API Methods
+    // Query string that points the result endpoints at this tab's analysis
+    jobQuery() {
+        return this.jobId ? `?job_id=${encodeURIComponent(this.jobId)}` : '';
+    }
+
     async makeRequest(endpoint, method = 'GET', data = null) {
         try {
             const options = {
@@ -125,14 +132,15 @@ class FrontendAPP {
 
         try {
             // Start analysis
-            await this.makeRequest('/start-analysis', 'POST', {
+            const started = await this.makeRequest('/start-analysis', 'POST', {
                 url: url,
                 numOfQueries: queryCount
             });
+            this.jobId = started.job_id;
 
-            // Switch to loading page and start polling
+            // Switch to loading page and start listening for status updates
             this.showPage('page2');
-            this.startStatusPolling();
+            this.startStatusUpdates();
 
         } catch (error) {
             this.showError(error.message);
@@ -193,21 +201,71 @@ class FrontendAPP {
         }
     }
 
-    // Page 2: Status Polling
+    // Page 2: Status updates (Server-Sent Events, falling back to polling)
+    startStatusUpdates() {
+        if (!window.EventSource) {
+            this.startStatusPolling();
+            return;
+        }
+
+        const stream = new EventSource(`${this.API_BASE_URL}/status/stream${this.jobQuery()}`);
+        this.statusStream = stream;
+
+        stream.addEventListener('status', (event) => {
+            const status = JSON.parse(event.data);
+            this.updateLoadingStatus(status);
+
+            // 'complete' is followed by the results event, which closes the stream
+            if (status.status !== 'complete') {
+                this.handleStoppedStatus(status);
+            }
+        });
+
+        stream.addEventListener('results', (event) => {
+            this.stopStatusUpdates();
+            this.displayAggregateResults(JSON.parse(event.data));
+            this.showPage('page3');
+        });
+
+        // Sent last by the server once the analysis stopped; close so EventSource does not reconnect
+        stream.addEventListener('end', () => {
+            if (this.statusStream === stream) {
+                this.stopStatusUpdates();
+            }
+        });
+
+        stream.onerror = () => {
+            // Stream unavailable (e.g. proxy without SSE support): fall back to polling
+            if (this.statusStream === stream && stream.readyState === EventSource.CLOSED) {
+                this.stopStatusUpdates();
+                this.startStatusPolling();
+            }
+        };
+    }
+
+    stopStatusUpdates() {
+        if (this.statusStream) {
+            this.statusStream.close();
+            this.statusStream = null;
+        }
+        if (this.pollingInterval) {
+            clearInterval(this.pollingInterval);
+            this.pollingInterval = null;
+        }
+    }
+
     startStatusPolling() {
         let pollCount = 0;
         this.pollingInterval = setInterval(async () => {
             try {
-                const status = await this.makeRequest('/status');
-                this.updateLoadingStatus(status, pollCount);
+                const status = await this.makeRequest(`/status${this.jobQuery()}`);
+                this.updateLoadingStatus(status);
 
                 if (status.status === 'complete') {
-                    clearInterval(this.pollingInterval);
+                    this.stopStatusUpdates();
                     this.loadAggregateResults();
-                } else if (status.status === 'error') {
-                    clearInterval(this.pollingInterval);
-                    this.showError('Analysis failed. Please try again.');
-                    this.showPage('page1');
+                } else {
+                    this.handleStoppedStatus(status);
                 }
 
                 pollCount++;
@@ -223,7 +281,20 @@ class FrontendAPP {
         }, 5000); // Poll every 5 seconds
     }
 
-    updateLoadingStatus(status, pollCount) {
+    // Shared by the status stream and polling: once the analysis is no longer
+    // running (and did not complete), stop listening and go back to the start page
+    handleStoppedStatus(status) {
+        if (status.status === 'analyzing') {
+            return;
+        }
+        this.stopStatusUpdates();
+        this.showError(status.status === 'idle'
+            ? 'Analysis was cancelled.'
+            : 'Analysis failed. Please try again.');
+        this.showPage('page1');
+    }
+
+    updateLoadingStatus(status) {
         const statusText = document.getElementById('loadingStatus');
         const progressText = document.getElementById('progressText');
 
@@ -231,10 +302,11 @@ class FrontendAPP {
             case 'analyzing':
                 statusText.textContent = `Analyzing ${status.url}...`;
                 
-                if (pollCount < 2) {
+                // num_queries is published once the queries are generated, queries_done as each one finishes
+                if (!status.num_queries) {
                     progressText.textContent = 'Generating search queries...';
-                } else if (pollCount < 6) {
-                    progressText.textContent = 'Running queries and collecting data...';
+                } else if (status.queries_done < status.num_queries) {
+                    progressText.textContent = `Running queries and collecting data (${status.queries_done}/${status.num_queries})...`;
                 } else {
                     progressText.textContent = 'Processing results...';
                 }
@@ -244,6 +316,16 @@ class FrontendAPP {
                 statusText.textContent = 'Analysis complete!';
                 progressText.textContent = 'Loading results...';
                 break;
+
+            case 'idle':
+                statusText.textContent = 'Analysis cancelled';
+                progressText.textContent = '';
+                break;
+
+            case 'error':
+                statusText.textContent = 'Analysis failed';
+                progressText.textContent = '';
+                break;
                 
             default:
                 progressText.textContent = 'Preparing analysis...';
@@ -253,7 +335,7 @@ class FrontendAPP {
     // Page 3: Aggregate Results
     async loadAggregateResults() {
         try {
-            const results = await this.makeRequest('/aggregate-results');
+            const results = await this.makeRequest(`/aggregate-results${this.jobQuery()}`);
             this.displayAggregateResults(results);
             this.showPage('page3');
         } catch (error) {
@@ -518,7 +600,7 @@ class FrontendAPP {
         this.currentQuery = query;
 
         try {
-            const queryDetails = await this.makeRequest('/query-details', 'POST', {
+            const queryDetails = await this.makeRequest(`/query-details${this.jobQuery()}`, 'POST', {
                 query: query
             });
             
@@ -822,10 +904,8 @@ class FrontendAPP {
     }
 
     async resetAnalysis() {
-        // Clear any polling
-        if (this.pollingInterval) {
-            clearInterval(this.pollingInterval);
-        }
+        // Stop any status stream or polling
+        this.stopStatusUpdates();
 
         // Reset form
         document.getElementById('urlInput').value = '';
@@ -837,7 +917,8 @@ class FrontendAPP {
 
         // Optionally reset the backend
         try {
-            await this.makeRequest('/reset', 'POST');
+            await this.makeRequest(`/reset${this.jobQuery()}`, 'POST');
+            this.jobId = null;
         } catch (error) {
             console.log('Reset request failed:', error);
             // Continue anyway - user can still start a new analysis
@@ -1,12 +1,35 @@
 
+import asyncio
 import os
 import json
+import functools
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from urllib.parse import urlparse
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
+from geminiClient.response_cache import ResponseCache
+
+
+URL_RESOLVE_CONCURRENCY = 16  # Maximum number of redirect URLs resolved at once, across all clients
+
+# Shared pool so concurrent queries cannot open an unbounded number of HEAD requests
+_url_resolver_pool = ThreadPoolExecutor(max_workers=URL_RESOLVE_CONCURRENCY, thread_name_prefix='url-resolver')
+
+# Shared HTTP session: grounding redirect URLs all point at the same host, so
+# keep-alive connections are reused instead of a new TLS handshake per URL.
+_http_session = requests.Session()
+_http_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=URL_RESOLVE_CONCURRENCY))
+_http_session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=URL_RESOLVE_CONCURRENCY))
+
+
+@functools.lru_cache(maxsize=8192)
+def _follow_redirects(redirect_url: str, timeout: int) -> str:
+    """Follow redirects with a HEAD request. Failures raise, so only successful lookups are cached."""
+    response = _http_session.head(redirect_url, allow_redirects=True, timeout=timeout)
+    return response.url
 
 
 class GeminiGroundedClient:
@@ -15,15 +38,17 @@ class GeminiGroundedClient:
     Handles response generation and metadata parsing.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.5-flash"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.5-flash", cache: Optional[ResponseCache] = None):
         """
         Initialize the Gemini client with grounding capabilities.
         
         Args:
             api_key: Google API key. If None, reads from environment variables.
             model: Gemini model to use for generation.
+            cache: Optional response cache used by process_query to skip repeated queries.
         """
         self.model = model
+        self.cache = cache
         self.api_key = self._get_api_key(api_key)
         self.client = genai.Client(api_key=self.api_key)
         self.grounding_tool = types.Tool(google_search=types.GoogleSearch())
@@ -48,6 +73,7 @@ class GeminiGroundedClient:
     def resolve_actual_url(self, redirect_url: str, timeout: int = 5) -> Optional[str]:
         """
         Resolve the actual URL from a redirect URL.
+        Successful resolutions are cached process-wide, so repeated links are only fetched once.
         
         Args:
             redirect_url: The redirect URL from Gemini grounding metadata.
@@ -58,8 +84,7 @@ class GeminiGroundedClient:
         """
         try:
             # Make a HEAD request to follow redirects without downloading content
-            response = requests.head(redirect_url, allow_redirects=True, timeout=timeout)
-            return response.url
+            return _follow_redirects(redirect_url, timeout)
         except Exception as e:
             print(f"Warning: Could not resolve URL {redirect_url}: {e}")
             return None
@@ -85,6 +110,38 @@ class GeminiGroundedClient:
         Returns:
             The response object from Gemini API.
         """
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=self._generation_config(use_grounding, structured_output, response_schema),
+        )
+        return response
+    
+    async def generate_response_async(self, prompt: str, use_grounding: bool = True, structured_output: bool = False, response_schema=None):
+        """
+        Async version of generate_response, using the SDK's native async client.
+        
+        The request is awaited on the caller's event loop, so no worker thread
+        is tied up for the duration of the LLM round-trip.
+        
+        Args:
+            prompt: The input prompt/question.
+            use_grounding: Whether to enable Google Search grounding.
+            structured_output: Whether to enable structured JSON output.
+            response_schema: Pydantic model or schema for structured output.
+            
+        Returns:
+            The response object from Gemini API.
+        """
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=self._generation_config(use_grounding, structured_output, response_schema),
+        )
+        return response
+    
+    def _generation_config(self, use_grounding: bool, structured_output: bool, response_schema):
+        """Build the GenerateContentConfig for a request (None for a plain, ungrounded call)."""
         config = self.config if use_grounding else None
         
         # If structured output is requested, modify or create config
@@ -96,12 +153,7 @@ class GeminiGroundedClient:
             config.response_mime_type = "application/json"
             config.response_schema = response_schema
         
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=config,
-        )
-        return response
+        return config
     
     def parse_grounding_metadata(self, candidate, resolve_urls: bool = True) -> Dict[str, Any]:
         """
@@ -141,6 +193,13 @@ class GeminiGroundedClient:
         resolved_chunks = {}  # Cache for resolved chunk data
         url_resolution_cache = {}  # Cache for URL resolutions
         
+        if resolve_urls:
+            # Resolve every distinct redirect URL concurrently on the shared, bounded pool
+            redirect_urls = list(dict.fromkeys(
+                chunk.web.uri for chunk in grounding_chunks if hasattr(chunk, 'web') and chunk.web
+            ))
+            url_resolution_cache = dict(zip(redirect_urls, _url_resolver_pool.map(self.resolve_actual_url, redirect_urls)))
+        
         for chunk_index, chunk in enumerate(grounding_chunks):
             if hasattr(chunk, 'web') and chunk.web:
                 redirect_url = chunk.web.uri
@@ -151,8 +210,6 @@ class GeminiGroundedClient:
                 }
                 
                 if resolve_urls:
-                    if redirect_url not in url_resolution_cache:
-                        url_resolution_cache[redirect_url] = self.resolve_actual_url(redirect_url)
                     link_info["actual_url"] = url_resolution_cache[redirect_url]
                 
                 resolved_chunks[chunk_index] = link_info
@@ -178,7 +235,7 @@ class GeminiGroundedClient:
         
         return result
 
-    def process_query(self, prompt: str, resolve_urls: bool = True, use_grounding: bool = True) -> Dict[str, Any]:
+    def process_query(self, prompt: str, resolve_urls: bool = True, use_grounding: bool = True, bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Process a query end-to-end: generate response and parse grounding metadata.
         
@@ -186,6 +243,7 @@ class GeminiGroundedClient:
             prompt: The input question/prompt.
             resolve_urls: Whether to resolve actual URLs from redirect URLs.
             use_grounding: Whether to use grounding for the response.
+            bypass_cache: If True, skip the cache lookup (the fresh result is still stored).
 
         Returns:
             Complete result structure:
@@ -204,9 +262,70 @@ class GeminiGroundedClient:
                 "has_grounding": bool            # True if AI used web search, False if answered from knowledge
             }
         """
+        cache_key, cached = self._cached_result(prompt, resolve_urls, use_grounding, bypass_cache)
+        if cached is not None:
+            return cached
+        
         # Generate response
         response = self.generate_response(prompt, use_grounding)
+        result = self._build_result(prompt, response, resolve_urls)
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        
+        return result
+    
+    async def aprocess_query(self, prompt: str, resolve_urls: bool = True, use_grounding: bool = True, bypass_cache: bool = False) -> Dict[str, Any]:
+        """
+        Async version of process_query; the Gemini call is awaited natively.
+        
+        The response cache (sqlite-backed) and redirect URL resolution (blocking
+        HEAD requests) are used from worker threads, so the event loop never
+        waits on disk or on redirects.
         
+        Args:
+            prompt: The input question/prompt.
+            resolve_urls: Whether to resolve actual URLs from redirect URLs.
+            use_grounding: Whether to use grounding for the response.
+            bypass_cache: If True, skip the cache lookup (the fresh result is still stored).
+
+        Returns:
+            Complete result structure (see process_query).
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key, cached = await asyncio.to_thread(self._cached_result, prompt, resolve_urls, use_grounding, bypass_cache)
+            if cached is not None:
+                return cached
+        
+        response = await self.generate_response_async(prompt, use_grounding)
+        if resolve_urls or cache_key is not None:
+            # One worker-thread hop for redirect resolution and the cache write
+            return await asyncio.to_thread(self._build_and_store, prompt, response, resolve_urls, cache_key)
+        return self._build_result(prompt, response, resolve_urls)
+    
+    def _cached_result(self, prompt: str, resolve_urls: bool, use_grounding: bool, bypass_cache: bool):
+        """Return (cache_key, cached_result); both are None when there is no cache, cached_result is None on a miss."""
+        if self.cache is None:
+            return None, None
+        
+        cache_key = ResponseCache.make_key(prompt, model=self.model, resolve_urls=resolve_urls, use_grounding=use_grounding)
+        if not bypass_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("Using cached Gemini response")
+                return cache_key, cached
+        return cache_key, None
+    
+    def _build_and_store(self, prompt: str, response, resolve_urls: bool, cache_key: Optional[str]) -> Dict[str, Any]:
+        """Build the result structure and store it in the cache under cache_key (if any); blocking."""
+        result = self._build_result(prompt, response, resolve_urls)
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
+    
+    def _build_result(self, prompt: str, response, resolve_urls: bool) -> Dict[str, Any]:
+        """Turn a Gemini response into the result structure returned by process_query."""
         # Extract text
         response_text = response.text
         
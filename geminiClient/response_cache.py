@@ -0,0 +1,131 @@
+"""
+Response cache for GeminiGroundedClient.
+
+Two tiers:
+- an in-process LRU dict for repeats within the same run
+- a sqlite table on disk so identical queries are reused across runs
+
+Entries are keyed by a hash of the prompt and the generation settings, and
+expire after a TTL so grounded (web search) answers do not go stale forever.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Dict, Optional
+
+import orjson
+
+
+class ResponseCache:
+    """
+    Two-tier (memory + sqlite) cache of processed Gemini responses.
+    Safe to share between threads.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: int = 24 * 60 * 60, max_memory_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path of the sqlite file. If None, only the in-memory tier is used.
+            ttl_seconds: How long an entry stays valid.
+            max_memory_entries: Maximum number of entries kept in the in-memory tier.
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+        if self.db_path:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS gemini_cache ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, ts INTEGER NOT NULL)"
+                )
+
+    @staticmethod
+    def make_key(prompt: str, **settings: Any) -> str:
+        """Build a stable cache key from the prompt and the settings that affect the response."""
+        payload = json.dumps([prompt, settings], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key produced by make_key.
+
+        Returns:
+            The cached response, or None on a miss or an expired entry.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_fresh(entry[0]):
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+
+        if not self.db_path:
+            return None
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute("SELECT response, ts FROM gemini_cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Warning: Gemini cache read failed: {e}")
+            return None
+
+        if row is None or not self._is_fresh(row[1]):
+            return None
+
+        value = orjson.loads(row[0])
+        self._remember(key, value, row[1])
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Key produced by make_key.
+            value: JSON-serializable response to cache.
+        """
+        stored_at = int(time.time())
+        self._remember(key, value, stored_at)
+
+        if not self.db_path:
+            return
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO gemini_cache (key, response, ts) VALUES (?, ?, ?)",
+                    (key, orjson.dumps(value).decode('utf-8'), stored_at)
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Warning: Gemini cache write failed: {e}")
+
+    def _remember(self, key: str, value: Dict[str, Any], stored_at: float):
+        with self._lock:
+            self._memory[key] = (stored_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,39 @@
+"""
+The one Gemini client the API process uses.
+
+Query generation, query analysis and structure analysis all send their
+prompts through this client, so the SDK's auth and HTTP connections are set
+up once per process and every cached response (one in-memory tier backed by
+GEMINI_CACHE_FILE) is visible to all three. GeminiGroundedClient holds no
+per-call state and ResponseCache locks internally, so the client is safe to
+share between threads and the event loop.
+"""
+
+import threading
+from typing import Optional
+
+from geminiClient.gemini import GeminiGroundedClient
+from geminiClient.response_cache import ResponseCache
+from reportStorage import REPORTS_DIR
+
+GEMINI_CACHE_FILE = REPORTS_DIR / 'gemini_cache.sqlite'
+
+_gemini_client: Optional[GeminiGroundedClient] = None
+_gemini_client_lock = threading.Lock()
+
+
+def get_gemini_client() -> GeminiGroundedClient:
+    """
+    Get the shared Gemini client, creating it on first use.
+
+    Created lazily so a missing API key surfaces where the client is first
+    needed (and each caller's own error handling) rather than as an import error.
+
+    Returns:
+        GeminiGroundedClient: The process-wide client, with the response cache attached.
+    """
+    global _gemini_client
+    with _gemini_client_lock:
+        if _gemini_client is None:
+            _gemini_client = GeminiGroundedClient(cache=ResponseCache(str(GEMINI_CACHE_FILE)))
+        return _gemini_client
@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for serving the Analysis API in production.
+
+    gunicorn -c gunicorn_conf.py asgi:app
+
+Analysis state (status, results) lives in the API process, so the default is
+a single Uvicorn worker; requests are still handled concurrently inside it.
+Only raise API_WORKERS if every endpoint you use is stateless.
+"""
+
+import os
+
+bind = os.environ.get('API_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('API_WORKERS', 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+keepalive = 30
+# Structure analyses crawl and call Gemini inside the request
+timeout = 300
+# Give running requests (and open status streams) time to finish on restart
+graceful_timeout = 30
+# Not preloaded: importing the app starts the background event loop thread
+# (eventLoop.py), and threads do not survive the fork into the worker
+preload_app = False
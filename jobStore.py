@@ -0,0 +1,102 @@
+"""
+Durable record of analysis jobs.
+
+Each analysis started through the API gets a job id and a row in a sqlite
+table (status, URL, query count, error), so clients can look a job up after it
+finishes and jobs that were cut off by a server restart show up as failed
+instead of disappearing.
+"""
+
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+INTERRUPTED_ERROR = 'Interrupted by a server restart'
+
+
+class JobStore:
+    """
+    sqlite-backed table of analysis jobs. Safe to share between threads.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (or create) the job table and fail any job left running by a previous process.
+
+        Args:
+            db_path: Path of the sqlite file. Parent directories are created if needed.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, url TEXT NOT NULL, num_queries INTEGER NOT NULL, "
+                "status TEXT NOT NULL, error TEXT, created_at INTEGER NOT NULL, updated_at INTEGER NOT NULL)"
+            )
+            # Analyses run inside the API process, so nothing can still be working on these
+            conn.execute(
+                "UPDATE jobs SET status = 'error', error = ?, updated_at = ? WHERE status = 'analyzing'",
+                (INTERRUPTED_ERROR, int(time.time()))
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def create(self, url: str, num_queries: int, job_id: Optional[str] = None) -> str:
+        """
+        Record a new job in the 'analyzing' state.
+
+        A job_id that is already recorded is left as it is, so a job whose
+        outcome was written first keeps it.
+
+        Args:
+            url: The URL being analyzed.
+            num_queries: Number of queries the analysis will generate.
+            job_id: Id to record the job under; a new one is generated if omitted.
+
+        Returns:
+            str: The job id.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        now = int(time.time())
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (id, url, num_queries, status, error, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'analyzing', NULL, ?, ?) ON CONFLICT(id) DO NOTHING",
+                (job_id, url, num_queries, now, now)
+            )
+        return job_id
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None):
+        """
+        Record a job's outcome.
+
+        Args:
+            job_id: Id returned by create.
+            status: Final status ('complete', 'error' or 'cancelled').
+            error: Error message for failed jobs.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error, int(time.time()), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Id returned by create.
+
+        Returns:
+            The job record, or None if the id is unknown.
+        """
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
@@ -0,0 +1,39 @@
+"""
+Logging setup for the API process.
+
+Records are handed to a queue and written to stderr by a listener thread, so
+code running on the event loop never blocks on a console write.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None):
+    """
+    Route the root logger through a QueueHandler. Calling it again has no effect.
+
+    Args:
+        level: Logging level name; defaults to the LOG_LEVEL environment variable, else INFO.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    records = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel((level or os.environ.get('LOG_LEVEL', 'INFO')).upper())
+
+    _listener = logging.handlers.QueueListener(records, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)  # flush queued records on shutdown
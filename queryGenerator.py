@@ -3,7 +3,7 @@ import asyncio
 import json
 import re
 from typing import List, Optional, Dict, Any
-from geminiClient.gemini import GeminiGroundedClient
+from geminiShared import get_gemini_client
 from domainAnalyzer.domain_analyzer import DomainAnalyzer
 from structure_recommendation.structure_analyzer import StructureAnalyzer
 from pydantic import BaseModel
@@ -33,7 +33,7 @@ async def crawl_website(url: str) -> Optional[dict]:
         Dictionary containing crawled data or None if failed
     """
     try:
-        result = await modular_geo_crawler.crawl_url(url)
+        result = await modular_geo_crawler.crawl_url_cached(url)
         
         if result and "clean_text" in result:
             return result
@@ -170,7 +170,7 @@ async def generate_queries_from_url(url: str, num_queries: int = NUM_OF_QUERIES,
     
     # Initialize Gemini client
     try:
-        client = GeminiGroundedClient()
+        client = get_gemini_client()
     except Exception as e:
         print(f"Error: Failed to initialize Gemini client - {e}")
         return []
@@ -183,7 +183,9 @@ async def generate_queries_from_url(url: str, num_queries: int = NUM_OF_QUERIES,
         try:
             print(f"Attempt {attempt + 1}/{max_retries}: Generating structured queries...")
             
-            response = client.generate_response(
+            # Blocking HTTP call: run it off the event loop
+            response = await asyncio.to_thread(
+                client.generate_response,
                 prompt, 
                 use_grounding=False,
                 structured_output=True,
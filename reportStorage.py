@@ -0,0 +1,69 @@
+"""
+Helpers for reading and writing the JSON reports under analysisReports/.
+"""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+import orjson
+
+REPORTS_DIR = Path('analysisReports')
+
+# Read once at import (os.umask can only be read by setting it, which is not
+# thread-safe later): new reports get the same mode open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def save_json(path: Union[str, Path], data: Any):
+    """
+    Write data as indented JSON, atomically.
+
+    The JSON is written to a temporary file next to the target and then renamed
+    over it, so an interrupted run never leaves a truncated report behind. Each
+    call gets its own temporary file, so concurrent analyses writing the same
+    report do not trip over each other (the last rename wins). The file keeps
+    the mode of the report it replaces, or gets the umask default when new
+    (mkstemp would otherwise leave it owner-only).
+
+    Args:
+        path: Destination file. Parent directories are created if needed.
+        data: JSON-serializable data.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    tmp_path = Path(tmp_name)
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            f.flush()
+            if hasattr(os, 'fchmod'):  # POSIX; Windows has no owner-only default to undo
+                try:
+                    mode = stat.S_IMODE(path.stat().st_mode)
+                except FileNotFoundError:
+                    mode = 0o666 & ~_UMASK
+                os.fchmod(f.fileno(), mode)
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    Read a JSON file.
+
+    Args:
+        path: File to read.
+
+    Returns:
+        The parsed JSON data.
+    """
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
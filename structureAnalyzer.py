@@ -1,49 +1,153 @@
-from typing import Dict, Any
+import asyncio
+import functools
+import json
+import logging
+import os
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Optional
+
+import orjson
 
 import crawler.modular_geo_crawler as modular_geo_crawler
+from asyncCache import AsyncTTLCache, url_cache_key
 from structure_recommendation.structure_analyzer import StructureAnalyzer
 from geminiClient.gemini import GeminiGroundedClient
+from geminiShared import get_gemini_client
+
+log = logging.getLogger(__name__)
+
+STRUCTURE_CACHE_TTL_SECONDS = 60 * 60
+STRUCTURE_CACHE_MAX_ENTRIES = 128
+GEMINI_CONCURRENCY = int(os.environ.get('GEMINI_CONCURRENCY', 8))  # recommendation calls in flight at once
+GEMINI_RATE_LIMIT_RETRIES = 3  # retries (with exponential backoff) after a 429
+
+# Used by extract_recommendations_from_response to decode a JSON value embedded in free text
+_JSON_DECODER = json.JSONDecoder()
+
+# Shared across requests: StructureAnalyzer is stateless (the Gemini client is
+# shared process-wide through geminiShared).
+_structure_analyzer = StructureAnalyzer()
+_gemini_semaphore = asyncio.Semaphore(GEMINI_CONCURRENCY)
+
+# normalized URL -> successful structure analysis
+_structure_cache = AsyncTTLCache(STRUCTURE_CACHE_TTL_SECONDS, STRUCTURE_CACHE_MAX_ENTRIES)
 
-async def perform_structure_analysis(url: str) -> Dict[str, Any]:
+async def _request_recommendations(client: GeminiGroundedClient, prompt: str) -> Dict[str, Any]:
+    """
+    Send the recommendations prompt to Gemini, bounded by GEMINI_CONCURRENCY.
+    
+    Rate-limited (429) calls are retried with exponential backoff; any other
+    error is raised to the caller.
+    """
+    for attempt in range(GEMINI_RATE_LIMIT_RETRIES + 1):
+        async with _gemini_semaphore:
+            try:
+                # Native async call: the loop keeps serving other analyses while Gemini answers
+                return await client.aprocess_query(prompt, resolve_urls=False)
+            except Exception as e:
+                if getattr(e, 'code', None) != 429 or attempt == GEMINI_RATE_LIMIT_RETRIES:
+                    raise
+        delay = 2 ** attempt
+        log.warning("Gemini rate limited, retrying in %ss", delay)
+        await asyncio.sleep(delay)
+
+async def perform_structure_analysis(url: str, force_refresh: bool = False) -> Dict[str, Any]:
     """
     Perform structure analysis for a given URL.
     
+    Successful results are cached per normalized URL for
+    STRUCTURE_CACHE_TTL_SECONDS, and concurrent requests for the same URL
+    wait for a single crawl + Gemini call instead of starting their own.
+    Callers must treat the returned dict as read-only.
+    
+    Args:
+        url: The URL to analyze
+        force_refresh: Drop the cached analysis and crawl for this URL and start over
+        
+    Returns:
+        Dictionary containing analysis results or error
+    """
+    key = url_cache_key(url)
+    if force_refresh:
+        _structure_cache.invalidate(key)
+    
+    return await _structure_cache.get_or_compute(
+        key,
+        lambda: _run_structure_analysis(url, force_refresh),
+        should_cache=lambda result: not result.get('error')
+    )
+
+def get_cached_structure_analysis(url: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached structure analysis without crawling or calling Gemini.
+    
+    Args:
+        url: The URL (any spelling that normalizes to the same key)
+        
+    Returns:
+        The cached result (read-only), or None if the URL has no fresh analysis
+    """
+    return _structure_cache.get(url_cache_key(url))
+
+async def prewarm_structure_cache(urls: List[str]):
+    """
+    Run the structure analysis for each URL so later requests are served from the cache.
+    
+    Crawls still go through the crawler's concurrency limit. Failures are
+    logged and skipped; they are not cached.
+    
+    Args:
+        urls: URLs expected to be requested soon
+    """
+    results = await asyncio.gather(*(perform_structure_analysis(url) for url in urls), return_exceptions=True)
+    for url, result in zip(urls, results):
+        if isinstance(result, BaseException) or result.get('error'):
+            error = result if isinstance(result, BaseException) else result['error']
+            log.warning("Pre-warming structure analysis for %s failed: %s", url, error)
+        else:
+            log.info("Pre-warmed structure analysis for %s", url)
+
+async def _run_structure_analysis(url: str, force_refresh: bool = False) -> Dict[str, Any]:
+    """
+    Crawl the URL and build structure analysis plus recommendations (uncached).
+    
     Args:
         url: The URL to analyze
+        force_refresh: Re-crawl instead of reusing a cached crawl
         
     Returns:
         Dictionary containing analysis results or error
     """
     try:
         # Step 1: Crawl website
-        crawled_data = await modular_geo_crawler.crawl_url(url)
+        crawled_data = await modular_geo_crawler.crawl_url_cached(url, force_refresh=force_refresh)
         
         if not crawled_data or "clean_text" not in crawled_data:
             return {'error': 'Failed to crawl website - no content found'}
         
         # Step 2: Analyze website structure
-        structure_analyzer = StructureAnalyzer()
-        structure_analysis = structure_analyzer.analyze_for_recommendations(crawled_data)
+        # HTML parsing is CPU-bound; run it in a worker thread so the shared loop keeps serving other requests
+        structure_analysis = await asyncio.to_thread(_structure_analyzer.analyze_for_recommendations, crawled_data)
         
         # Step 3: Get AI-powered structure recommendations  
         structure_recommendations = []
         try:
-            client = GeminiGroundedClient()
+            client = get_gemini_client()
             rec_prompt = get_structure_recommendations_prompt(structure_analysis, crawled_data)
             
-            print(f"Sending prompt to AI: {rec_prompt[:200]}...")
-            rec_response = client.process_query(rec_prompt, resolve_urls=False)
-            print(f"AI response received: {rec_response['response_text']}")
+            log.debug("Sending prompt to AI: %.200s...", rec_prompt)
+            rec_response = await _request_recommendations(client, rec_prompt)
+            log.debug("AI response received: %s", rec_response['response_text'])
             
             structure_recommendations = extract_recommendations_from_response(rec_response["response_text"])
             
             # If AI failed, ensure we have fallback
             if not structure_recommendations:
-                print("Warning: AI returned no recommendations, using intelligent fallback")
+                log.warning("AI returned no recommendations, using intelligent fallback")
                 structure_recommendations = generate_fallback_recommendations(structure_analysis)
                 
         except Exception as e:
-            print(f"Error: AI recommendation generation failed - {e}")
+            log.error("AI recommendation generation failed - %s", e)
             structure_recommendations = generate_fallback_recommendations(structure_analysis)
         
         return {
@@ -54,287 +158,292 @@ async def perform_structure_analysis(url: str) -> Dict[str, Any]:
     except Exception as e:
         return {'error': f'Structure analysis failed: {str(e)}'}
 
-def generate_fallback_recommendations(structure_analysis: dict) -> list:
-    """
-    Generate simple, direct GEO recommendations.
+@dataclass(frozen=True)
+class _StructureSummary:
+    """The structure_analysis fields that the prompt and the fallback rules look at."""
+    missing_meta: List[str]
+    word_count: int
+    h1_count: int
+    total_headings: int
+    missing_elements: List[str]
+    has_faq: bool
+    has_structured_data: bool
+    json_ld_count: int
+    has_llm_txt: bool
+
+_SUMMARY_FIELDS = tuple(field.name for field in fields(_StructureSummary))
+
+def _summarize(structure_analysis: dict) -> _StructureSummary:
     """
-    recommendations = []
+    Pull the fields used for recommendations out of structure_analysis in one pass.
     
-    missing_meta = structure_analysis.get('meta_completeness', {}).get('missing_critical', [])
+    Args:
+        structure_analysis: Output of StructureAnalyzer.analyze_for_recommendations
+        
+    Returns:
+        _StructureSummary: Flat view with the same defaults as the original lookups
+    """
     headings = structure_analysis.get('heading_structure', {})
-    word_count = structure_analysis.get('content_metrics', {}).get('word_count', 0)
-    h1_count = headings.get('distribution', {}).get('h1', 0)
-    h2_count = headings.get('distribution', {}).get('h2', 0)
-    total_headings = headings.get('total', 0)
-    missing_elements = structure_analysis.get('semantic_elements', {}).get('missing_elements', [])
-    faq_data = structure_analysis.get('faq_structure', {})
     schema_data = structure_analysis.get('schema_markup', {})
-    
-    # 1. LLM.txt for Generative Engine Optimization (GEO) - HIGH PRIORITY
-    llm_txt_analysis = structure_analysis.get('llm_txt_analysis', {})
-    if not llm_txt_analysis.get('has_llm_txt', False):
-        recommendations.append({
-            "title": "Add LLM.txt File",
-            "description": "Create an LLM.txt file with structured instructions for AI systems to improve generative engine optimization and AI citations.",
-            "priority": "High"
-        })
-    
-    # 2. Meta tags
-    if missing_meta:
-        recommendations.append({
-            "title": "Add Missing Meta Tags",
-            "description": f"Add these missing meta tags: {', '.join(missing_meta)}. Include title, description, and Open Graph tags.",
-            "priority": "High"
-        })
-    
-    # 3. Heading structure
-    if h1_count == 0:
-        recommendations.append({
-            "title": "Add H1 Heading",
-            "description": "Add one clear H1 heading that describes your main topic.",
-            "priority": "High"
-        })
-    elif h1_count > 1:
-        recommendations.append({
-            "title": "Fix Multiple H1 Tags",
-            "description": f"Use only one H1 tag. Convert the other {h1_count-1} H1 tags to H2 or H3.",
-            "priority": "High"
-        })
-    elif total_headings < 3:
-        recommendations.append({
-            "title": "Add More Headings",
-            "description": f"Add more H2 and H3 headings to organize your content better (currently {total_headings}).",
-            "priority": "Medium"
-        })
-    
-    # 3. Content length
-    if word_count < 300:
-        recommendations.append({
-            "title": "Expand Content",
-            "description": f"Increase content from {word_count} to at least 300-500 words for better authority.",
-            "priority": "Medium"
-        })
-    
-    # 4. Semantic structure
-    if 'article' in missing_elements or 'section' in missing_elements:
-        recommendations.append({
-            "title": "Add Semantic HTML",
-            "description": "Use semantic HTML5 tags like <article>, <section>, <header>, and <main>.",
-            "priority": "Medium"
-        })
-    
-    # 5. Schema markup - prioritize JSON-LD for AI systems
-    json_ld_count = schema_data.get('types', {}).get('json_ld', 0)
-    if json_ld_count == 0:
-        recommendations.append({
-            "title": "Add JSON-LD Schema",
-            "description": "Implement JSON-LD structured data markup for optimal AI understanding and citation.",
-            "priority": "High"
-        })
-    
-    # 6. FAQ structure
-    if not faq_data.get('has_faq', False) and word_count > 500:
-        recommendations.append({
-            "title": "Add FAQ Section",
-            "description": "Create a FAQ section with structured Q&A format for common questions.",
-            "priority": "Low"
-        })
-    
-    # Fill to exactly 4 recommendations
-    while len(recommendations) < 4:
-        if len(recommendations) == 0:
-            recommendations.append({
-                "title": "Add Meta Description",
-                "description": "Create a 150-160 character meta description for this page.",
-                "priority": "High"
-            })
-        elif len(recommendations) == 1:
-            recommendations.append({
-                "title": "Improve Page Structure",
-                "description": "Organize content with proper headings and semantic HTML elements.",
-                "priority": "Medium"
-            })
-        elif len(recommendations) == 2:
-            recommendations.append({
-                "title": "Add Schema Markup",
-                "description": "Implement JSON-LD structured data for AI citation optimization.",
-                "priority": "Medium"
-            })
-        else:
-            recommendations.append({
-                "title": "Enhance Content Structure",
-                "description": "Add FAQ sections and improve content organization for better AI understanding.",
-                "priority": "Low"
-            })
-    
-    return recommendations[:4]
+    return _StructureSummary(
+        missing_meta=structure_analysis.get('meta_completeness', {}).get('missing_critical', []),
+        word_count=structure_analysis.get('content_metrics', {}).get('word_count', 0),
+        h1_count=headings.get('distribution', {}).get('h1', 0),
+        total_headings=headings.get('total', 0),
+        missing_elements=structure_analysis.get('semantic_elements', {}).get('missing_elements', []),
+        has_faq=structure_analysis.get('faq_structure', {}).get('has_faq', False),
+        has_structured_data=schema_data.get('has_structured_data', False),
+        json_ld_count=schema_data.get('types', {}).get('json_ld', 0),
+        has_llm_txt=structure_analysis.get('llm_txt_analysis', {}).get('has_llm_txt', False),
+    )
 
-def get_structure_recommendations_prompt(structure_analysis: dict, crawled_data: dict) -> str:
+# Generic recommendations used to pad the fallback list to 4 entries, by position.
+# Kept as plain dicts (copied on use) so results stay orjson-serializable.
+_FALLBACK_FILLERS = (
+    {
+        "title": "Add Meta Description",
+        "description": "Create a 150-160 character meta description for this page.",
+        "priority": "High"
+    },
+    {
+        "title": "Improve Page Structure",
+        "description": "Organize content with proper headings and semantic HTML elements.",
+        "priority": "Medium"
+    },
+    {
+        "title": "Add Schema Markup",
+        "description": "Implement JSON-LD structured data for AI citation optimization.",
+        "priority": "Medium"
+    },
+    {
+        "title": "Enhance Content Structure",
+        "description": "Add FAQ sections and improve content organization for better AI understanding.",
+        "priority": "Low"
+    },
+)
+
+# Priority of each fallback recommendation, by the issue it addresses
+_FALLBACK_PRIORITY = {
+    "llm_txt": "High",
+    "missing_meta": "High",
+    "no_h1": "High",
+    "multiple_h1": "High",
+    "few_headings": "Medium",
+    "thin_content": "Medium",
+    "semantic_html": "Medium",
+    "json_ld": "High",
+    "faq": "Low",
+}
+
+# Rule-based recommendations in the order they are tried:
+# (issue, applies(summary), title, description(summary)). The three heading
+# rules are mutually exclusive, so at most one of them fires.
+_FALLBACK_RULES = (
+    ("llm_txt",
+     lambda s: not s.has_llm_txt,
+     "Add LLM.txt File",
+     lambda s: "Create an LLM.txt file with structured instructions for AI systems to improve generative engine optimization and AI citations."),
+    ("missing_meta",
+     lambda s: bool(s.missing_meta),
+     "Add Missing Meta Tags",
+     lambda s: f"Add these missing meta tags: {', '.join(s.missing_meta)}. Include title, description, and Open Graph tags."),
+    ("no_h1",
+     lambda s: s.h1_count == 0,
+     "Add H1 Heading",
+     lambda s: "Add one clear H1 heading that describes your main topic."),
+    ("multiple_h1",
+     lambda s: s.h1_count > 1,
+     "Fix Multiple H1 Tags",
+     lambda s: f"Use only one H1 tag. Convert the other {s.h1_count-1} H1 tags to H2 or H3."),
+    ("few_headings",
+     lambda s: s.h1_count == 1 and s.total_headings < 3,
+     "Add More Headings",
+     lambda s: f"Add more H2 and H3 headings to organize your content better (currently {s.total_headings})."),
+    ("thin_content",
+     lambda s: s.word_count < 300,
+     "Expand Content",
+     lambda s: f"Increase content from {s.word_count} to at least 300-500 words for better authority."),
+    ("semantic_html",
+     lambda s: 'article' in s.missing_elements or 'section' in s.missing_elements,
+     "Add Semantic HTML",
+     lambda s: "Use semantic HTML5 tags like <article>, <section>, <header>, and <main>."),
+    ("json_ld",
+     lambda s: s.json_ld_count == 0,
+     "Add JSON-LD Schema",
+     lambda s: "Implement JSON-LD structured data markup for optimal AI understanding and citation."),
+    ("faq",
+     lambda s: not s.has_faq and s.word_count > 500,
+     "Add FAQ Section",
+     lambda s: "Create a FAQ section with structured Q&A format for common questions."),
+)
+
+def generate_fallback_recommendations(structure_analysis: dict) -> list:
     """
-    Generate a simple, direct prompt for GEO() recommendations.
+    Generate simple, direct GEO recommendations.
+    
+    The first 4 applicable _FALLBACK_RULES are used, padded with generic
+    recommendations when fewer apply.
     """
-    # Get key issues
-    missing_meta = structure_analysis.get('meta_completeness', {}).get('missing_critical', [])
-    word_count = structure_analysis.get('content_metrics', {}).get('word_count', 0)
-    headings = structure_analysis.get('heading_structure', {})
-    h1_count = headings.get('distribution', {}).get('h1', 0)
-    h2_count = headings.get('distribution', {}).get('h2', 0)
-    total_headings = headings.get('total', 0)
-    missing_elements = structure_analysis.get('semantic_elements', {}).get('missing_elements', [])
-    faq_data = structure_analysis.get('faq_structure', {})
-    schema_data = structure_analysis.get('schema_markup', {})
-    llm_txt_data = structure_analysis.get('llm_txt_analysis', {})
+    summary = _summarize(structure_analysis)
+    recommendations = [
+        {"title": title, "description": describe(summary), "priority": _FALLBACK_PRIORITY[issue]}
+        for issue, applies, title, describe in _FALLBACK_RULES
+        if applies(summary)
+    ][:4]
+    
+    # Fill to exactly 4 recommendations; slot i always gets filler i
+    recommendations.extend(map(dict, _FALLBACK_FILLERS[len(recommendations):4]))
     
-    prompt = f"""Analyze this website for GEO (Generative Engine Optimization) and give 4 direct recommendations.
+    return recommendations
+
+# Static parts of the recommendations prompt; only the ISSUES FOUND block is formatted per call
+_STRUCTURE_PROMPT_PREFIX = """Analyze this website for GEO (Generative Engine Optimization) and give 4 direct recommendations.
 
 GEO is about optimizing content for AI systems like Gemini that cite and reference web content. Not about geographic or local SEO.
 
-ISSUES FOUND:
+"""
+
+_STRUCTURE_PROMPT_ISSUES = """ISSUES FOUND:
 - Missing meta tags: {missing_meta}
 - Word count: {word_count}
 - H1 tags: {h1_count}
 - Total headings: {total_headings}
 - Missing elements: {missing_elements}
-- FAQ structure: {faq_data.get('has_faq', False)}
-- Schema markup: {schema_data.get('has_structured_data', False)}
-- LLM.txt file: {llm_txt_data.get('has_llm_txt', False)}
+- FAQ structure: {has_faq}
+- Schema markup: {has_structured_data}
+- LLM.txt file: {has_llm_txt}
+
+"""
 
-Give 4 short, direct recommendations for AI citation optimization. Focus on what AI systems need to understand and cite your content.
+_STRUCTURE_PROMPT_SUFFIX = """Give 4 short, direct recommendations for AI citation optimization. Focus on what AI systems need to understand and cite your content.
 
 IMPORTANT: If the site is missing an LLM.txt file (has_llm_txt: False), include a recommendation to add it for better generative engine optimization.
 
 Format:
 [
-  {{
+  {
     "title": "Add Meta Description",
     "description": "Create a 150-160 character meta description for this page.",
     "priority": "High"
-  }},
-  {{
+  },
+  {
     "title": "Fix Heading Structure", 
     "description": "Add proper H1 tag and organize content with H2/H3 headings.",
     "priority": "High"
-  }},
-  {{
+  },
+  {
     "title": "Add Schema Markup",
     "description": "Implement JSON-LD structured data for better content understanding.",
     "priority": "Medium"
-  }},
-  {{
+  },
+  {
     "title": "Improve Content Structure",
     "description": "Use semantic HTML tags like article, section, and header.",
     "priority": "Medium"
-  }}
+  }
 ]
 
 Return ONLY the JSON array, nothing else."""
+
+def get_structure_recommendations_prompt(structure_analysis: dict, crawled_data: dict) -> str:
+    """
+    Generate a simple, direct prompt for GEO() recommendations.
+    """
+    # Key on the summary values (lists frozen to tuples), so structurally identical pages share one prompt
+    summary = _summarize(structure_analysis)
+    return _build_structure_prompt(tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (getattr(summary, name) for name in _SUMMARY_FIELDS)
+    ))
+
+@functools.lru_cache(maxsize=256)
+def _build_structure_prompt(summary_values: tuple) -> str:
+    """Render the prompt for one set of _StructureSummary values, in _SUMMARY_FIELDS order."""
+    # Lists go back to lists so the prompt text is unchanged; the template only references summary fields
+    issues = _STRUCTURE_PROMPT_ISSUES.format_map({
+        name: list(value) if isinstance(value, tuple) else value
+        for name, value in zip(_SUMMARY_FIELDS, summary_values)
+    })
+    return ''.join((_STRUCTURE_PROMPT_PREFIX, issues, _STRUCTURE_PROMPT_SUFFIX))
+
+def _is_recommendation_list(value: Any) -> bool:
+    return isinstance(value, list) and any(isinstance(rec, dict) and "title" in rec for rec in value)
+
+def _find_recommendation_array(text: str) -> Optional[list]:
+    """
+    Find the first JSON array of recommendation objects in the response text.
     
-    return prompt
+    Tries the whole text first (the prompt asks for a bare array), then the
+    span from the first '[' to the last ']' (an array wrapped in prose or a
+    markdown code fence). Only if both fail does it walk the '[' positions
+    and decode a complete JSON value from each one. Nested arrays are handled
+    by the decoder, and no regex cleanup pass is needed.
+    """
+    start = text.find('[')
+    end = text.rfind(']')
+    candidates = [text]
+    if 0 <= start < end and (start, end) != (0, len(text) - 1):  # the span differs from the whole text
+        candidates.append(text[start:end + 1])
+    for candidate in candidates:
+        try:
+            parsed = orjson.loads(candidate)
+            if _is_recommendation_list(parsed):
+                return parsed
+        except orjson.JSONDecodeError:
+            pass
+    
+    idx = start
+    while idx != -1:
+        try:
+            value, end = _JSON_DECODER.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            idx = text.find('[', idx + 1)
+            continue
+        if _is_recommendation_list(value):
+            return value
+        idx = text.find('[', end)
+    return None
 
 def extract_recommendations_from_response(response_text: str) -> list:
     """
     Extract structure recommendations from Gemini response with enhanced debugging.
     """
-    import json
-    import re
-    
     recommendations = []
     
     try:
-        print(f"AI Response length: {len(response_text)} characters")
-        # print(f"First 200 chars: {response_text[:200]}")
-        
-        # Clean the response more thoroughly
-        cleaned_response = response_text.strip()
+        log.debug("AI Response length: %d characters", len(response_text))
         
-        # Remove markdown code blocks
-        cleaned_response = re.sub(r'^```json\s*', '', cleaned_response, flags=re.MULTILINE)
-        cleaned_response = re.sub(r'^```\s*', '', cleaned_response, flags=re.MULTILINE)
-        cleaned_response = re.sub(r'\s*```$', '', cleaned_response, flags=re.MULTILINE)
+        parsed_data = _find_recommendation_array(response_text)
+        if parsed_data is None:
+            log.warning("AI response parsing failed - using fallback recommendations")
+            return []
         
-        # Remove any leading/trailing text that's not JSON
-        lines = cleaned_response.split('\n')
-        start_idx = -1
-        end_idx = -1
-        
-        for i, line in enumerate(lines):
-            if line.strip().startswith('['):
-                start_idx = i
-                break
-        
-        for i in range(len(lines) - 1, -1, -1):
-            if lines[i].strip().endswith(']'):
-                end_idx = i
-                break
-        
-        if start_idx != -1 and end_idx != -1:
-            json_lines = lines[start_idx:end_idx + 1]
-            cleaned_response = '\n'.join(json_lines)
-        
-        print(f"Cleaned response: {cleaned_response}")
-        
-        # Try to parse as JSON directly
-        try:
-            parsed_data = json.loads(cleaned_response)
-            if isinstance(parsed_data, list):
-                print(f"Successfully parsed {len(parsed_data)} recommendations from AI")
-                for rec in parsed_data:
-                    if isinstance(rec, dict) and "title" in rec and "description" in rec:
-                        # Clean up text and remove unwanted characters
-                        title = str(rec.get("title", "")).replace(",,", "").replace("  ", " ").strip()
-                        description = str(rec.get("description", "")).replace(",,", "").replace("  ", " ").strip()
-                        priority = str(rec.get("priority", "Medium")).strip()
-                        
-                        # Remove incomplete sentences that end abruptly
-                        if description.endswith(" an") or description.endswith(" the") or description.endswith(" a"):
-                            description = description.rsplit(' ', 1)[0] + "."
-                        
-                        if title and description and len(description) > 20:  # Ensure meaningful content
-                            recommendations.append({
-                                "title": title,
-                                "description": description,
-                                "priority": priority
-                            })
+        log.debug("Successfully parsed %d recommendations from AI", len(parsed_data))
+        for rec in parsed_data:
+            if isinstance(rec, dict) and "title" in rec and "description" in rec:
+                # Clean up text and remove unwanted characters
+                title = str(rec.get("title", "")).replace(",,", "").replace("  ", " ").strip()
+                description = str(rec.get("description", "")).replace(",,", "").replace("  ", " ").strip()
+                priority = str(rec.get("priority", "Medium")).strip()
                 
-                if recommendations:
-                    print(f"Extracted {len(recommendations)} valid recommendations")
-                    return recommendations[:4]
-            
-        except json.JSONDecodeError as e:
-            print(f"Direct JSON parsing failed: {e}")
-            
-            # Try to find JSON array pattern as fallback
-            json_pattern = r'\[[\s\S]*?\]'
-            json_matches = re.findall(json_pattern, cleaned_response, re.DOTALL)
-            
-            for json_str in json_matches:
-                try:
-                    parsed_recs = json.loads(json_str)
-                    if isinstance(parsed_recs, list) and len(parsed_recs) > 0:
-                        print(f"Found valid JSON array with {len(parsed_recs)} items")
-                        for rec in parsed_recs:
-                            if isinstance(rec, dict) and "title" in rec and "description" in rec:
-                                title = str(rec.get("title", "")).replace(",,", "").strip()
-                                description = str(rec.get("description", "")).replace(",,", "").strip()
-                                priority = str(rec.get("priority", "Medium")).strip()
-                                
-                                if title and description:
-                                    recommendations.append({
-                                        "title": title,
-                                        "description": description,
-                                        "priority": priority
-                                    })
-                        
-                        if recommendations:
-                            return recommendations[:4]
-                            
-                except json.JSONDecodeError as e2:
-                    print(f"Fallback JSON parsing failed: {e2}")
-                    continue
+                # Remove incomplete sentences that end abruptly
+                if description.endswith(" an") or description.endswith(" the") or description.endswith(" a"):
+                    description = description.rsplit(' ', 1)[0] + "."
+                
+                if title and description and len(description) > 20:  # Ensure meaningful content
+                    recommendations.append({
+                        "title": title,
+                        "description": description,
+                        "priority": priority
+                    })
+        
+        if recommendations:
+            log.debug("Extracted %d valid recommendations", len(recommendations))
+            return recommendations[:4]
         
-        print("Warning: AI response parsing failed - using fallback recommendations")
+        log.warning("AI response parsing failed - using fallback recommendations")
         return []
         
     except Exception as e:
-        print(f"Error extracting recommendations: {e}")
+        log.error("Error extracting recommendations: %s", e)
         return []
@@ -0,0 +1,153 @@
+"""
+Tests for AnalyzerRegistry: locking around cancellation, and which finished
+analyses are reused.
+
+Uses stand-in analyzers whose run is a coroutine on the shared event loop,
+so no crawl or Gemini call is made.
+"""
+
+import asyncio
+import threading
+import types
+import unittest
+import uuid
+
+import eventLoop
+from analyzerRegistry import AnalyzerRegistry
+
+
+class _SlowAnalyzer:
+    """Analyzer stand-in: submit_analysis schedules a coroutine that sleeps until cancelled."""
+
+    queriesToRun = 3
+
+    def __init__(self):
+        self._future = None
+        self._job_id = uuid.uuid4().hex
+
+    def submit_analysis(self, url=None, saveResults=True, queriesToRun=None, bypass_cache=False):
+        self._future = eventLoop.submit(asyncio.sleep(60))
+        return self._future
+
+    def cancel_analysis(self):
+        return self._future is not None and self._future.cancel()
+
+    def get_state(self):
+        return types.SimpleNamespace(job_id=self._job_id)
+
+
+class _FinishedAnalyzer(_SlowAnalyzer):
+    """Analyzer stand-in whose run finishes right away with the given queries and results."""
+
+    def __init__(self, queries):
+        super().__init__()
+        self.generated_queries = []
+        self._queries = queries
+
+    def submit_analysis(self, url=None, saveResults=True, queriesToRun=None, bypass_cache=False):
+        async def run():
+            self.generated_queries = list(self._queries)
+            return [{'query': query} for query in self._queries]
+        self._future = eventLoop.submit(run())
+        return self._future
+
+
+def _call_with_timeout(test, fn, timeout=5):
+    """Run fn in a thread and fail the test if it does not return within timeout."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('value', fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    test.assertFalse(thread.is_alive(), f'{fn.__name__} did not return within {timeout}s')
+    return result.get('value')
+
+
+class ResetWhileRunningTest(unittest.TestCase):
+    def test_reset_cancels_running_analysis_without_deadlock(self):
+        registry = AnalyzerRegistry(_SlowAnalyzer)
+        analyzer, cached = registry.start('https://example.com', 3)
+        self.assertFalse(cached)
+
+        fresh = _call_with_timeout(self, registry.reset)
+
+        self.assertIsNot(fresh, analyzer)
+        self.assertTrue(analyzer._future.cancelled())
+        # The lock was released and the cancelled run no longer counts as running
+        second, _ = _call_with_timeout(self, lambda: registry.start('https://example.com', 3))
+        self.assertIsNot(second, analyzer)
+        second.cancel_analysis()
+
+    def test_cancel_job_while_running(self):
+        registry = AnalyzerRegistry(_SlowAnalyzer)
+        analyzer, _ = registry.start('https://example.com', 3)
+
+        cancelled = _call_with_timeout(self, lambda: registry.cancel(analyzer.get_state().job_id))
+
+        self.assertTrue(cancelled)
+        self.assertIsNone(registry.completed_for('https://example.com'))
+
+
+
+class CompletedReuseTest(unittest.TestCase):
+    URL = 'https://example.com'
+
+    def _start_and_wait(self, registry, **kwargs):
+        """Start an analysis and wait until the registry's done-callback has handled it."""
+        analyzer, cached = registry.start(self.URL, 3, **kwargs)
+        # Added after the registry's callback, so it runs after it
+        handled = threading.Event()
+        analyzer._future.add_done_callback(lambda _: handled.set())
+        self.assertTrue(handled.wait(5))
+        return analyzer, cached
+
+    def test_run_with_results_is_reused(self):
+        registry = AnalyzerRegistry(lambda: _FinishedAnalyzer(['q1', 'q2']))
+        first, _ = self._start_and_wait(registry)
+
+        second, cached = registry.start(self.URL, 3)
+
+        self.assertTrue(cached)
+        self.assertIs(second, first)
+        self.assertIs(registry.completed_for(self.URL), first)
+
+    def test_run_without_queries_is_not_reused(self):
+        registry = AnalyzerRegistry(lambda: _FinishedAnalyzer([]))
+        first, _ = self._start_and_wait(registry)
+
+        second, cached = self._start_and_wait(registry)
+
+        self.assertFalse(cached)
+        self.assertIsNot(second, first)
+        self.assertIsNone(registry.completed_for(self.URL))
+
+    def test_reset_evicts_current_completed_analysis(self):
+        registry = AnalyzerRegistry(lambda: _FinishedAnalyzer(['q1']))
+        first, _ = self._start_and_wait(registry)
+
+        registry.reset()
+        second, cached = self._start_and_wait(registry)
+
+        self.assertFalse(cached)
+        self.assertIsNot(second, first)
+
+    def test_force_refresh_runs_again(self):
+        registry = AnalyzerRegistry(lambda: _FinishedAnalyzer(['q1']))
+        first, _ = self._start_and_wait(registry)
+
+        second, cached = self._start_and_wait(registry, force_refresh=True)
+
+        self.assertFalse(cached)
+        self.assertIsNot(second, first)
+
+    def test_expired_analysis_is_not_reused(self):
+        registry = AnalyzerRegistry(lambda: _FinishedAnalyzer(['q1']), completed_ttl=0)
+        first, _ = self._start_and_wait(registry)
+
+        second, cached = self._start_and_wait(registry)
+
+        self.assertFalse(cached)
+        self.assertIsNot(second, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
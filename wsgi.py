@@ -0,0 +1,22 @@
+"""
+WSGI entry point for the Analysis API
+========================================
+
+Serves the Flask app from api.py under any threaded WSGI server, without the
+ASGI translation layer of asgi.py:
+
+    gunicorn -k gthread --threads 32 -b 0.0.0.0:8000 wsgi:app
+
+Keep a single worker process, as with asgi.py: the analyzer state lives in the
+API process.
+
+Do not use gevent or eventlet workers. Their monkey-patching turns threads into
+greenlets, but the crawls and Gemini calls run on the asyncio loop in
+eventLoop.py, which needs a real background thread of its own. Request threads
+here only wait on that loop's futures, so plain threads already give the same
+I/O concurrency.
+"""
+
+from api import app
+
+__all__ = ['app']